@@ -1,18 +1,44 @@
 # (C) DiamondDev. Donate to Jingle Jam!
 import pygame
+import argparse
 
 from src import window
+from src import headless
+from src import trace
 from src.game import game
 from src.menu import mainmenu
 
 
 
 if __name__ == "__main__":
-    pygame.init()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--headless', action='store_true', help="run a scene with dummy SDL drivers and a fixed timestep, as fast as possible")
+    parser.add_argument('--scene', choices=list(headless.SCENES), default='game', help="scene to start in when running headless")
+    parser.add_argument('--frames', type=int, default=3600, help="frames to simulate when running headless")
+    parser.add_argument('--dt', type=float, default=1 / 60, help="fixed timestep when running headless")
+    parser.add_argument('--seed', type=int, default=0, help="rng seed when running headless")
+    parser.add_argument('--no-draw', action='store_true', help="skip building and rendering the draw queue when running headless")
+    parser.add_argument('--trace', action='store_true', help="record frame spans, dumped as chrome trace json on F9 and on exit")
+    parser.add_argument('--profile-frames', type=int, default=0, metavar='N', help="cProfile the first N frames (F10 profiles the next 300 in game)")
+    args = parser.parse_args()
 
-    wnd = window.Window(mainmenu.MainMenu)
-    wnd.init_resources()
+    trace.Tracer.enable(args.trace)
+
+    if args.headless:
+        runner = headless.HeadlessRunner(headless.SCENES[args.scene], args.dt, args.seed, draw=not args.no_draw)
+        runner.window.profiler.request(args.profile_frames)
+        print(runner.run(args.frames))
+        if runner.window.profiler.last_path is not None:
+            print(f"profile written to {runner.window.profiler.last_path}")
+        if args.trace:
+            print(f"trace written to {trace.Tracer.dump()}")
+    else:
+        pygame.init()
+
+        wnd = window.Window(mainmenu.MainMenu)
+        wnd.init_resources()
+        wnd.profiler.request(args.profile_frames)
+        
+        wnd.start()
     
-    wnd.start()
     
-    
\ No newline at end of file
@@ -0,0 +1,98 @@
+import pygame
+import typing
+
+from src import trace
+
+GLOBAL_SCOPE: int = 0
+
+class TextureEntry():
+    def __init__(self, surface: pygame.Surface) -> None:
+        self.surface = surface
+        self.refs = 0
+        self.nbytes = surface.get_pitch() * surface.get_height()
+
+class AssetRegistry():
+    TEXTURES: dict[str, TextureEntry] = {}
+    SCOPES: dict[int, dict[str, int]] = {GLOBAL_SCOPE: {}}
+
+    current_scope: int = GLOBAL_SCOPE
+    hits: int = 0
+    misses: int = 0
+
+    _next_scope: int = GLOBAL_SCOPE + 1
+
+    @staticmethod
+    def acquire_texture(path: str, scope: int | None = None) -> pygame.Surface:
+        scope = AssetRegistry.current_scope if scope is None else scope
+
+        entry = AssetRegistry.TEXTURES.get(path)
+        if entry is None:
+            AssetRegistry.misses += 1
+            with trace.span('AssetRegistry.load', {'path': path}):
+                entry = TextureEntry(pygame.image.load(path).convert_alpha())
+            AssetRegistry.TEXTURES[path] = entry
+        else:
+            AssetRegistry.hits += 1
+
+        entry.refs += 1
+        owned = AssetRegistry.SCOPES.setdefault(scope, {})
+        owned[path] = owned.get(path, 0) + 1
+
+        return entry.surface
+
+    @staticmethod
+    def release_texture(path: str, scope: int | None = None, count: int = 1):
+        scope = AssetRegistry.current_scope if scope is None else scope
+
+        owned = AssetRegistry.SCOPES.get(scope, {})
+        count = min(count, owned.get(path, 0))
+        if count <= 0:
+            return
+
+        owned[path] -= count
+        if owned[path] <= 0:
+            del owned[path]
+
+        entry = AssetRegistry.TEXTURES[path]
+        entry.refs -= count
+        if entry.refs <= 0:
+            del AssetRegistry.TEXTURES[path]
+
+    @staticmethod
+    def open_scope() -> int:
+        scope = AssetRegistry._next_scope
+        AssetRegistry._next_scope += 1
+        AssetRegistry.SCOPES[scope] = {}
+        return scope
+
+    @staticmethod
+    def enter_scope(scope: int) -> int:
+        previous = AssetRegistry.current_scope
+        AssetRegistry.current_scope = scope
+        return previous
+
+    @staticmethod
+    def release_scope(scope: int):
+        if scope == GLOBAL_SCOPE:
+            return
+
+        for path, count in list(AssetRegistry.SCOPES.get(scope, {}).items()):
+            AssetRegistry.release_texture(path, scope, count)
+        AssetRegistry.SCOPES.pop(scope, None)
+
+        if AssetRegistry.current_scope == scope:
+            AssetRegistry.current_scope = GLOBAL_SCOPE
+
+    @staticmethod
+    def bytes_held() -> int:
+        return sum(entry.nbytes for entry in AssetRegistry.TEXTURES.values())
+
+    @staticmethod
+    def stats() -> dict[str, typing.Any]:
+        return {
+            'textures': len(AssetRegistry.TEXTURES),
+            'hits': AssetRegistry.hits,
+            'misses': AssetRegistry.misses,
+            'bytes': AssetRegistry.bytes_held(),
+            'scopes': len(AssetRegistry.SCOPES),
+        }
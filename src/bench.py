@@ -0,0 +1,330 @@
+import pygame
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import timeit
+import tracemalloc
+import typing
+
+from src import consts
+from src import headless
+from src import util
+from src.render import animate
+from src.render import camera
+from src.render import map
+from src.render import spritesheet
+from src.render import text
+from src.game import game
+from src.game import interact
+from src.game import item
+from src.game import manager
+from src.game import pirate
+from src.game import projectile
+from src.game import ship
+
+type _Bench = typing.Callable[[], typing.Any]
+type _Setup = typing.Callable[[headless.HeadlessRunner], _Bench]
+
+class Benchmark():
+    def __init__(self, name: str, setup: _Setup, number: int, macro: bool = False) -> None:
+        self.name = name
+        self.setup = setup
+        self.number = number
+        self.macro = macro
+
+    def run(self, runner: headless.HeadlessRunner, repeat: int, scale: float = 1.0) -> dict[str, typing.Any]:
+        random.seed(runner.seed)
+        fn = self.setup(runner)
+        number = max(1, int(self.number * scale))
+
+        fn() # warm caches the same way a running game would have them
+        times = timeit.Timer(fn, timer=time.perf_counter).repeat(repeat=repeat, number=number)
+        per_call = [t / number for t in times]
+
+        return {
+            'number': number,
+            'repeat': repeat,
+            'best_us': min(per_call) * 1e6,
+            'mean_us': sum(per_call) / len(per_call) * 1e6,
+            'macro': self.macro,
+        }
+
+class MemoryBenchmark(Benchmark):
+    def __init__(self, name: str, setup: _Setup, number: int) -> None:
+        super().__init__(name, setup, number)
+
+    def run(self, runner: headless.HeadlessRunner, repeat: int, scale: float = 1.0) -> dict[str, typing.Any]:
+        random.seed(runner.seed)
+        make = self.setup(runner)
+        number = max(1, int(self.number * scale))
+
+        make() # first instance pays for shared textures and frame tables
+        keep: list[typing.Any] = [None] * number
+        gc.collect()
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        for i in range(number):
+            keep[i] = make()
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        return {
+            'number': number,
+            'bytes_per_entity': (after - before) / number,
+            'memory': True,
+        }
+
+def _headline(result: dict[str, typing.Any]) -> tuple[float, str]:
+    if result.get('memory'):
+        return result['bytes_per_entity'], 'B'
+    return result['best_us'], 'us'
+
+def _camera(runner: headless.HeadlessRunner) -> camera.Camera:
+    cam = runner.window.camera
+    cam.focus = pygame.Vector2(16 * consts.DRAW_SCALE * 16, 0)
+    cam.zoom = 1.0
+    return cam
+
+def setup_camera_blit(runner: headless.HeadlessRunner) -> _Bench:
+    cam = _camera(runner)
+    canvas = runner.window.canvas
+    frame = animate.AnimatedTexture(spritesheet.Spritesheet(util.load_texture('res/pirate.png')), {'': (1, [(0, 0)])}).get_frame()
+    positions = [pygame.Vector2(random.uniform(0, 2048), random.uniform(-300, 500)) for _ in range(200)]
+
+    def _run():
+        for pos in positions:
+            cam.blit(frame, pos, scale=consts.DRAW_SCALE)
+        cam.render(canvas)
+    return _run
+
+def setup_camera_blit_rotated(runner: headless.HeadlessRunner) -> _Bench:
+    cam = _camera(runner)
+    canvas = runner.window.canvas
+    frame = spritesheet.Spritesheet(util.load_texture('res/items.png')).get_cell(0, 0)
+    sprites = [(pygame.Vector2(random.uniform(0, 2048), random.uniform(-300, 500)), random.uniform(0, 360)) for _ in range(200)]
+
+    def _run():
+        for pos, rot in sprites:
+            cam.blit(frame, pos, scale=consts.DRAW_SCALE, rotation=rot)
+        cam.render(canvas)
+    return _run
+
+def _ship_map() -> map.MapRenderer.MapData:
+    return ship.Ship().map_data
+
+def setup_map_draw(runner: headless.HeadlessRunner) -> _Bench:
+    cam = _camera(runner)
+    data = _ship_map()
+
+    def _run():
+        map.MapRenderer.draw_map(cam, pygame.Vector2(), data, consts.DRAW_SCALE)
+        cam.render(runner.window.canvas)
+    return _run
+
+def setup_map_draw_baked(runner: headless.HeadlessRunner) -> _Bench:
+    cam = _camera(runner)
+    baked = map.MapRenderer.bake_map(_ship_map(), consts.DRAW_SCALE)
+
+    def _run():
+        map.MapRenderer.draw_baked(cam, pygame.Vector2(), baked)
+        cam.render(runner.window.canvas)
+    return _run
+
+def setup_font_render_adv(runner: headless.HeadlessRunner) -> _Bench:
+    font = text.glyphxel()
+
+    def _run():
+        font.render_adv("Landlubbin' Mateys (Good Guys): 100.0% ship integrity", 2, color=0x005f41)
+    return _run
+
+def setup_font_render_adv_uncached(runner: headless.HeadlessRunner) -> _Bench:
+    font = text.glyphxel()
+
+    def _run():
+        text.PixelFont.RENDER_CACHE.clear()
+        font.render_adv("Landlubbin' Mateys (Good Guys): 100.0% ship integrity", 2, color=0x005f41)
+    return _run
+
+def setup_anim_get_frame(runner: headless.HeadlessRunner) -> _Bench:
+    p = pirate.Pirate(None, pygame.Vector2()) # type: ignore
+    anim = p.anim_tex
+
+    def _run():
+        anim.flipped = not anim.flipped
+        anim.get_frame()
+    return _run
+
+def setup_resolve_collision(runner: headless.HeadlessRunner) -> _Bench:
+    static = pygame.Rect(100, 100, 48, 48)
+    dynamic = pygame.Rect(120, 130, 64, 64)
+
+    def _run():
+        util.resolve_collision(static, dynamic)
+    return _run
+
+def setup_projectile_barrage(runner: headless.HeadlessRunner) -> _Bench:
+    cam = _camera(runner)
+    canvas = runner.window.canvas
+    system = projectile.ProjectileSystem()
+
+    def _spawn(n: int):
+        for _ in range(n):
+            system.spawn(random.randint(0, len(item.Item.ITEMS) - 1), pygame.Vector2(random.uniform(0, 2048), random.uniform(-1400, 200)), fired_up=False)
+    _spawn(5000)
+
+    def _run():
+        _spawn(len(system.update(1 / 60)))
+        system.draw(cam)
+        cam.render(canvas)
+    return _run
+
+def _manager(runner: headless.HeadlessRunner) -> manager.GameManager:
+    runner.window.scene_manager.change(runner.window.camera, game.GameScene, ())
+    scene = runner.scene()
+    assert isinstance(scene, game.GameScene)
+    return scene.manager
+
+def setup_mem_npc_pirate(runner: headless.HeadlessRunner) -> _Bench:
+    mgr = _manager(runner)
+    return lambda: pirate.NPCPirate(mgr, pygame.Vector2(random.uniform(0, 2048), random.uniform(0, 300)))
+
+def setup_mem_item(runner: headless.HeadlessRunner) -> _Bench:
+    return lambda: item.Item(random.randint(0, len(item.Item.ITEMS) - 1), pygame.Vector2(random.uniform(0, 2048), random.uniform(0, 300)))
+
+def setup_mem_damage_spot(runner: headless.HeadlessRunner) -> _Bench:
+    return lambda: interact.DamageSpot(0, 1.0, pygame.Vector2(random.uniform(0, 2048), random.uniform(0, 300)))
+
+def setup_mem_cannon(runner: headless.HeadlessRunner) -> _Bench:
+    return lambda: interact.Cannon(pygame.Vector2(random.uniform(0, 2048), random.uniform(0, 300)))
+
+def setup_mem_anim(runner: headless.HeadlessRunner) -> _Bench:
+    sheet = spritesheet.Spritesheet(util.load_texture('res/pirate.png'))
+    return lambda: animate.AnimatedTexture(sheet, {'': (1, [(0, 0)])})
+
+def populate(mgr: manager.GameManager, pirates: int, items: int, damage_spots: int):
+    for _ in range(pirates):
+        mgr.active_pirates.append(pirate.NPCPirate(mgr, mgr.ship_map.get_tile_center(mgr.camera, random.uniform(2, 29), random.uniform(1, 5))))
+
+    for _ in range(items):
+        pos = mgr.ship_map.get_tile_center(mgr.camera, random.uniform(2, 29), random.uniform(1, 5))
+        mgr.spawn_item(random.randint(0, len(item.Item.ITEMS) - 1), pos)
+
+    for _ in range(damage_spots):
+        pos = mgr.ship_map.get_tile_center(mgr.camera, random.uniform(2, 29), random.uniform(1, 5))
+        mgr.add_interactable_idx(lambda i: interact.DamageSpot(i, 1.0, pos))
+
+def scenario(pirates: int, items: int, damage_spots: int) -> _Setup:
+    def _setup(runner: headless.HeadlessRunner) -> _Bench:
+        mgr = _manager(runner)
+        populate(mgr, pirates, items, damage_spots)
+
+        def _run():
+            # keep the match from ending so every frame measures the same scene
+            mgr.boat_health = 100.0
+            mgr.enemy_health = 100.0
+            mgr.player.scurvy_time = pirate.Pirate.SCURVY_TIME
+            runner.step()
+        return _run
+    return _setup
+
+BENCHMARKS: list[Benchmark] = [
+    Benchmark('camera_blit_render', setup_camera_blit, 50),
+    Benchmark('camera_blit_render_rotated', setup_camera_blit_rotated, 50),
+    Benchmark('map_draw', setup_map_draw, 50),
+    Benchmark('map_draw_baked', setup_map_draw_baked, 50),
+    Benchmark('font_render_adv', setup_font_render_adv, 2000),
+    Benchmark('font_render_adv_uncached', setup_font_render_adv_uncached, 500),
+    Benchmark('anim_get_frame', setup_anim_get_frame, 20000),
+    Benchmark('resolve_collision', setup_resolve_collision, 20000),
+    Benchmark('projectile_barrage_5000', setup_projectile_barrage, 50),
+    MemoryBenchmark('mem_npc_pirate', setup_mem_npc_pirate, 500),
+    MemoryBenchmark('mem_item', setup_mem_item, 2000),
+    MemoryBenchmark('mem_damage_spot', setup_mem_damage_spot, 2000),
+    MemoryBenchmark('mem_cannon', setup_mem_cannon, 2000),
+    MemoryBenchmark('mem_anim_texture', setup_mem_anim, 5000),
+    Benchmark('game_default', scenario(0, 0, 0), 60, macro=True),
+    Benchmark('game_crew_30_items_100_spots_30', scenario(30, 100, 30), 30, macro=True),
+    Benchmark('game_crew_100_items_500_spots_100', scenario(100, 500, 100), 10, macro=True),
+]
+
+def run_all(names: list[str] | None = None, repeat: int = 5, scale: float = 1.0, seed: int = 0) -> dict[str, typing.Any]:
+    runner = headless.HeadlessRunner(game.GameScene, seed=seed)
+
+    results: dict[str, typing.Any] = {}
+    for bench in BENCHMARKS:
+        if names and not any(n in bench.name for n in names):
+            continue
+        results[bench.name] = bench.run(runner, repeat, scale)
+        value, unit = _headline(results[bench.name])
+        print(f"{bench.name:<40} {value:>12.1f} {unit}")
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'seed': seed,
+            'repeat': repeat,
+            'scale': scale,
+        },
+        'results': results,
+    }
+
+def compare(current: dict[str, typing.Any], baseline: dict[str, typing.Any], threshold: float) -> list[str]:
+    regressions: list[str] = []
+    for name, result in current['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if base is None:
+            print(f"{name:<40} {'new':>12}")
+            continue
+
+        value, unit = _headline(result)
+        base_value, _ = _headline(base)
+        ratio = value / base_value if base_value > 0 else float('inf')
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = 'REGRESSION'
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = 'better'
+        print(f"{name:<40} {base_value:>12.1f} -> {value:>12.1f} {unit}  x{ratio:.2f} {flag}")
+    return regressions
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m src.bench')
+    parser.add_argument('names', nargs='*', help="only run benchmarks whose name contains one of these")
+    parser.add_argument('--out', default='bench.json', help="where to write the results json")
+    parser.add_argument('--compare', metavar='BASELINE', help="baseline results json to check for regressions")
+    parser.add_argument('--threshold', type=float, default=0.10, help="relative slowdown that counts as a regression")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--scale', type=float, default=1.0, help="multiplier on the calls per repeat")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # read before anything is written, --out may well be the baseline itself
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    current = run_all(args.names, args.repeat, args.scale, args.seed)
+
+    regressions: list[str] = []
+    if baseline is not None:
+        regressions = compare(current, baseline, args.threshold)
+
+    with open(args.out, 'w') as f:
+        json.dump(current, f, indent=2)
+
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,8 +6,39 @@ AUTHOR: str = "DiamondDev"
 CANVAS_DIMS: tuple[int, int] = (1920, 1080)
 WINDOW_DIMS: tuple[int, int] = (1280, 720)
 TARGET_FRAMERATE: int = 0
+PRESENT_MODE: str = 'nearest'
 
 
 DRAW_COLLISION_BOXES: bool = False
+STATS_OVERLAY_VISIBLE: bool = False
+STATS_OVERLAY_REFRESH: float = 0.25
+STATS_WINDOW: int = 240
+TRACE_BUFFER_EVENTS: int = 200_000
+TRACE_DIR: str = 'traces'
+PROFILE_FRAMES: int = 300
+PROFILE_DIR: str = 'profiles'
 DRAW_SCALE: float = 4
-HUD_LAYER: int = 20
\ No newline at end of file
+HUD_LAYER: int = 20
+STATS_LAYER: int = 1000
+ZINDEX_MIN: int = -16
+ZINDEX_MAX: int = 1024
+
+SOUND_CHANNELS: int = 16
+SOUND_MAX_VOICES: int = 4
+
+TRANSFORM_CACHE_BYTES: int = 64 * 1024 * 1024
+TRANSFORM_ROTATION_STEP: float = 2.0
+
+MAP_CHUNK_TILES: int = 16
+TEXT_CACHE_ENTRIES: int = 256
+
+PROJECTILE_CAPACITY: int = 256
+SPATIAL_CELL_SIZE: int = 128
+AI_BRAIN_BUDGET: int = 16
+BATCHED_NPC_MOVEMENT: bool = False
+NAV_CELL_SIZE: int = 32
+NAV_CLEARANCE: int = 32
+NAV_GOAL_RADIUS: float = 96
+NAV_TARGET_BUCKET: int = 4
+NAV_TARGET_FIELD_ENTRIES: int = 256
+NAV_BUILD_BUDGET: int = 8
\ No newline at end of file
@@ -1,7 +1,6 @@
 import pygame
 import typing
-import threading
-import time
+import heapq
 
 class CallbackManager():
     CALLBACKS: dict[int, list[typing.Callable[[dict], typing.Any]]] = {}
@@ -13,30 +12,77 @@ class CallbackManager():
         CallbackManager.CALLBACKS[id] = callbacks
 
 
-def schedule(op: typing.Callable, delay: float):
-    def _threadactivity(f, d):
-        time.sleep(d)
-        f()
+class Timer():
+    def __init__(self, owner: typing.Hashable | None) -> None:
+        self.owner = owner
+        self.cancelled = False
 
-    thread = threading.Thread(name="ScheduledFunction", target=_threadactivity, args=[op, delay], daemon=True)
-    thread.start()
+    def cancel(self):
+        self.cancelled = True
 
-def schedule_provider[T](op: typing.Callable[[T], typing.Any], delay: float, t: T):
-    def _threadactivity(f, d, t):
-        time.sleep(d)
-        f(t)
+class Scheduler():
+    def __init__(self) -> None:
+        self.time = 0.0
+        self.owner: typing.Hashable | None = None
+        self.fired = 0
 
-    thread = threading.Thread(name="ScheduledFunctionProvider", target=_threadactivity, args=[op, delay, t], daemon=True)
-    thread.start()
+        self._heap: list[tuple[float, int, Timer, typing.Callable]] = []
+        self._next_seq = 0
 
-def sequence(steps: list[tuple[typing.Callable, float]]):
-    def _threadactivity(s):
-        for step in s:
-            time.sleep(step[1])
-            step[0]()
+    def __len__(self) -> int:
+        return len(self._heap)
 
-    thread = threading.Thread(name="ScheduledFunction", target=_threadactivity, args=[steps], daemon=True)
-    thread.start()
+    def call_later(self, op: typing.Callable, delay: float, timer: Timer | None = None) -> Timer:
+        if timer is None:
+            timer = Timer(self.owner)
+        # the sequence number keeps callbacks due on the same tick in scheduling order
+        heapq.heappush(self._heap, (self.time + max(delay, 0.0), self._next_seq, timer, op))
+        self._next_seq += 1
+        return timer
+
+    def tick(self, dt: float):
+        self.time += dt
+
+        while self._heap and self._heap[0][0] <= self.time:
+            _, _, timer, op = heapq.heappop(self._heap)
+            if timer.cancelled:
+                continue
+            self.fired += 1
+            op()
+
+    def cancel_owner(self, owner: typing.Hashable | None):
+        for entry in self._heap:
+            if entry[2].owner == owner:
+                entry[2].cancel()
+        self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+        heapq.heapify(self._heap)
+
+    def clear(self):
+        for entry in self._heap:
+            entry[2].cancel()
+        self._heap = []
+
+SCHEDULER: Scheduler = Scheduler()
+
+
+def schedule(op: typing.Callable, delay: float) -> Timer:
+    return SCHEDULER.call_later(op, delay)
+
+def schedule_provider[T](op: typing.Callable[[T], typing.Any], delay: float, t: T) -> Timer:
+    return SCHEDULER.call_later(lambda: op(t), delay)
+
+def sequence(steps: list[tuple[typing.Callable, float]]) -> Timer:
+    # each step waits its own delay after the previous one ran, all steps share one cancellable timer
+    timer = Timer(SCHEDULER.owner)
+
+    def _run(idx: int):
+        steps[idx][0]()
+        if idx + 1 < len(steps):
+            SCHEDULER.call_later(lambda: _run(idx + 1), steps[idx + 1][1], timer)
+
+    if len(steps) > 0:
+        SCHEDULER.call_later(lambda: _run(0), steps[0][1], timer)
+    return timer
 
 
 CHANGE_SCENE: int = pygame.event.custom_type()
\ No newline at end of file
@@ -2,37 +2,98 @@ from __future__ import annotations
 import pygame
 import random
 import typing
+import bisect
 
+from src import consts
+from src import trace
 from src.render import camera
 
 type _TaskProvider[T] = type[Task[T]]
 
 class Brain[T]():
+    decisions: int = 0
+    fallbacks: int = 0
 
     def __init__(self) -> None:
-        self.task_pool: list[_TaskProvider[T]] = []
+        self.tasks: list[_TaskProvider[T]] = []
+        self.weights: list[int] = []
+        # one instance per task type, only ever asked prereq
+        self.prototypes: list[Task[T]] = []
+
+        # picked when no task's prereq passes, None leaves the brain idle until the next decision
+        self.fallback: _TaskProvider[T] | None = None
 
         self.task: Task | None = None
 
     def add_task(self, task_provider: _TaskProvider[T], weight: int = 1):
-        for _ in range(weight):
-            self.task_pool.append(task_provider)
+        if weight <= 0:
+            return
+        self.tasks.append(task_provider)
+        self.weights.append(weight)
+        self.prototypes.append(task_provider())
 
     def update(self, dt: float, cam: camera.Camera, t: T):
-        if self.task is None or (self.task.can_finish(t) or self.task.age > 20):
-            self.pick_task(t)
-        if self.task is not None:
-            self.task.process(dt, cam, t)
+        with trace.span('Brain.update'):
+            if self.task is None or (self.task.can_finish(t) or self.task.age > 20):
+                self.pick_task(t)
+            if self.task is not None:
+                self.task.process(dt, cam, t)
 
 
     def pick_task(self, t: T):
-        while True:
-            proposed_task = random.choice(self.task_pool)()
-            if proposed_task.prereq(t):
-                self.task = proposed_task
-                self.task.start(t)
-                break
+        Brain.decisions += 1
+
+        cumulative: list[int] = []
+        eligible: list[_TaskProvider[T]] = []
+        total = 0
+        for provider, weight, prototype in zip(self.tasks, self.weights, self.prototypes):
+            if prototype.prereq(t):
+                total += weight
+                cumulative.append(total)
+                eligible.append(provider)
+
+        if total > 0:
+            provider = eligible[bisect.bisect_right(cumulative, random.random() * total)]
+        elif self.fallback is not None:
+            Brain.fallbacks += 1
+            provider = self.fallback
+        else:
+            Brain.fallbacks += 1
+            self.task = None
+            return
+
+        self.task = provider()
+        self.task.start(t)
+        trace.instant('Brain.pick_task', {'task': provider.__name__})
+
+
+class BrainScheduler():
+    # round-robins which agents get a brain update this frame, at most budget of them (<= 0 is unlimited)
+    def __init__(self, budget: int = consts.AI_BRAIN_BUDGET) -> None:
+        self.budget = budget
+        self.cursor = 0
+        self.due: set[int] = set()
+
+        self.updates = 0
+        self.deferred = 0
+
+    def begin_frame(self, agents: list[typing.Any]):
+        self.due.clear()
+        n = len(agents)
+        if n <= 0:
+            return
+
+        k = n if self.budget <= 0 else min(self.budget, n)
+        start = self.cursor % n
+        for i in range(k):
+            self.due.add(id(agents[(start + i) % n]))
+        self.cursor = (start + k) % n
+
+        self.updates += k
+        self.deferred += n - k
 
+    def is_due(self, agent: typing.Any) -> bool:
+        return id(agent) in self.due
 
 class Task[T]():
     def __init__(self) -> None:
@@ -3,12 +3,15 @@ import typing
 
 from src import consts
 from src import event
+from src import sound
 
 if typing.TYPE_CHECKING:
     from src.game import pirate
     from src.game import interact
 
 class Fireable():
+    __slots__ = ('hidden', 'fired', 'fired_up', 'cannon_sound')
+
     FIRE_SPEED: float = 400
     FIRE_ROT_SPEED: float = 360
 
@@ -16,7 +19,7 @@ class Fireable():
         self.hidden = False
         self.fired = False
         self.fired_up = True
-        self.cannon_sound = pygame.mixer.Sound('res/sound/cannon.ogg')
+        self.cannon_sound = sound.get('res/sound/cannon.ogg')
 
     def hide(self):
         self.hidden = True
@@ -33,3 +33,6 @@ class GameScene(scene.Scene):
 
         camera.focus = pygame.Vector2(16 * consts.DRAW_SCALE * 16, 0)
         self.manager.update(dt, camera)
+
+    def entity_counts(self) -> dict[str, int]:
+        return self.manager.entity_counts()
@@ -3,6 +3,7 @@ import random
 
 from src import util
 from src import event
+from src import sound
 from src import consts
 from src.render import spritesheet
 from src.render import animate
@@ -13,6 +14,8 @@ from src.game import pirate
 
 
 class Interactable():
+    __slots__ = ('position', 'collider', 'highlight', 'removal_mark')
+
     def __init__(self, pos: pygame.Vector2 = pygame.Vector2()) -> None:
         self.position = pos
         self.collider = pygame.Rect(0, 0, 0, 0)
@@ -32,6 +35,8 @@ class Interactable():
         return True
 
 class Cannon(Interactable):
+    __slots__ = ('spritesheet', 'collider_base', 'anim_tex', 'cooldown')
+
     ANIM_IDLE: str = "idle"
     ANIM_SELECTABLE: str = "selectable"
     ANIM_FIRE: str = "firing"
@@ -58,30 +63,24 @@ class Cannon(Interactable):
         )
 
         if self.cooldown > 0:
-            cam.with_zindex(
-                lambda s: pygame.draw.rect(s, 0x000000, cam.w2s_r(
-                    pygame.Rect(
-                        self.position - pygame.Vector2(12 * consts.DRAW_SCALE, 12 * consts.DRAW_SCALE),
-                        pygame.Vector2(100, 20),
-                    )
-                )), zindex=-2
-            )
-            cam.with_zindex(
-                lambda s: pygame.draw.rect(s, 0xffffff, cam.w2s_r(
-                    pygame.Rect(
-                        self.position - pygame.Vector2(11 * consts.DRAW_SCALE, 11 * consts.DRAW_SCALE),
-                        pygame.Vector2(90, 10),
-                    )
-                )), zindex=-1
-            )
-            cam.with_zindex(
-                lambda s: pygame.draw.rect(s, 0x00ff00, cam.w2s_r(
-                    pygame.Rect(
-                        self.position - pygame.Vector2(11 * consts.DRAW_SCALE, 11 * consts.DRAW_SCALE),
-                        pygame.Vector2(90 * (self.cooldown / Cannon.COOLDOWN), 10),
-                    )
-                )), zindex=-1
-            )
+            cam.draw_rect(0x000000, cam.w2s_r(
+                pygame.Rect(
+                    self.position - pygame.Vector2(12 * consts.DRAW_SCALE, 12 * consts.DRAW_SCALE),
+                    pygame.Vector2(100, 20),
+                )
+            ), zindex=-2)
+            cam.draw_rect(0xffffff, cam.w2s_r(
+                pygame.Rect(
+                    self.position - pygame.Vector2(11 * consts.DRAW_SCALE, 11 * consts.DRAW_SCALE),
+                    pygame.Vector2(90, 10),
+                )
+            ), zindex=-1)
+            cam.draw_rect(0x00ff00, cam.w2s_r(
+                pygame.Rect(
+                    self.position - pygame.Vector2(11 * consts.DRAW_SCALE, 11 * consts.DRAW_SCALE),
+                    pygame.Vector2(90 * (self.cooldown / Cannon.COOLDOWN), 10),
+                )
+            ), zindex=-1)
 
     def update(self, dt: float, cam: camera.Camera):
 
@@ -95,7 +94,7 @@ class Cannon(Interactable):
 
     def interact(self, user: pirate.Pirate):
         if self.cooldown <= 0:
-            user.manager.fire_cannon(user, user.manager.items[user.held_item_idx] if user.held_item_idx != -1 else None, self)
+            user.manager.fire_cannon(user, user.held_item(), self)
             user.held_item_idx = -1
 
     def fire(self, firer: pirate.Pirate, fireable: fireable.Fireable):
@@ -113,6 +112,8 @@ class Cannon(Interactable):
         return self.cooldown <= 0
 
 class ItemBarrel(Interactable):
+    __slots__ = ('spritesheet', 'collider_base', 'anim_tex', 'cooldown', 'barrel_sound')
+
     ANIM_IDLE: str = 'idle'
     ANIM_SELECTABLE: str = 'selectable'
 
@@ -129,7 +130,7 @@ class ItemBarrel(Interactable):
                                                 })
         
         self.cooldown = 0.0
-        self.barrel_sound = pygame.mixer.Sound('res/sound/barrel.ogg')
+        self.barrel_sound = sound.get('res/sound/barrel.ogg')
 
     def draw(self, cam: camera.Camera):
         cam.blit(
@@ -137,30 +138,24 @@ class ItemBarrel(Interactable):
         )
 
         if self.cooldown > 0:
-            cam.with_zindex(
-                lambda s: pygame.draw.rect(s, 0x000000, cam.w2s_r(
-                    pygame.Rect(
-                        self.position - pygame.Vector2(12 * consts.DRAW_SCALE, 12 * consts.DRAW_SCALE),
-                        pygame.Vector2(100, 20),
-                    )
-                )), zindex=-2
-            )
-            cam.with_zindex(
-                lambda s: pygame.draw.rect(s, 0xffffff, cam.w2s_r(
-                    pygame.Rect(
-                        self.position - pygame.Vector2(11 * consts.DRAW_SCALE, 11 * consts.DRAW_SCALE),
-                        pygame.Vector2(90, 10),
-                    )
-                )), zindex=-1
-            )
-            cam.with_zindex(
-                lambda s: pygame.draw.rect(s, 0x00ff00, cam.w2s_r(
-                    pygame.Rect(
-                        self.position - pygame.Vector2(11 * consts.DRAW_SCALE, 11 * consts.DRAW_SCALE),
-                        pygame.Vector2(90 * (self.cooldown / ItemBarrel.COOLDOWN), 10),
-                    )
-                )), zindex=-1
-            )
+            cam.draw_rect(0x000000, cam.w2s_r(
+                pygame.Rect(
+                    self.position - pygame.Vector2(12 * consts.DRAW_SCALE, 12 * consts.DRAW_SCALE),
+                    pygame.Vector2(100, 20),
+                )
+            ), zindex=-2)
+            cam.draw_rect(0xffffff, cam.w2s_r(
+                pygame.Rect(
+                    self.position - pygame.Vector2(11 * consts.DRAW_SCALE, 11 * consts.DRAW_SCALE),
+                    pygame.Vector2(90, 10),
+                )
+            ), zindex=-1)
+            cam.draw_rect(0x00ff00, cam.w2s_r(
+                pygame.Rect(
+                    self.position - pygame.Vector2(11 * consts.DRAW_SCALE, 11 * consts.DRAW_SCALE),
+                    pygame.Vector2(90 * (self.cooldown / ItemBarrel.COOLDOWN), 10),
+                )
+            ), zindex=-1)
 
     def update(self, dt: float, cam: camera.Camera):
         if self.cooldown <= 0:
@@ -181,10 +176,10 @@ class ItemBarrel(Interactable):
         if user.held_item_idx != -1:
             return
 
-        i: item.Item | None = None
-        while i is None or not i.in_barrels() or (isinstance(user, pirate.NPCPirate) and not i.ai_picks_up()):
-            i = item.Item(random.randint(0, len(item.Item.ITEMS) - 1))
-        idx = user.manager.add_item(i)
+        id = -1
+        while id == -1 or not item.Item.id_in_barrels(id) or (isinstance(user, pirate.NPCPirate) and not item.Item.id_ai_picks_up(id)):
+            id = random.randint(0, len(item.Item.ITEMS) - 1)
+        idx = user.manager.spawn_item(id)
         user.pickup_item(idx)
         self.barrel_sound.play()
 
@@ -192,6 +187,8 @@ class ItemBarrel(Interactable):
         return self.cooldown <= 0
     
 class DamageSpot(Interactable):
+        __slots__ = ('spritesheet', 'anim_tex', 'idx', 'damage', 'repair_sound')
+
         ANIM_IDLE: str = 'idle'
         ANIM_SELECTABLE: str = 'selectable'
 
@@ -206,7 +203,7 @@ class DamageSpot(Interactable):
             
             self.idx = idx
             self.damage = damage
-            self.repair_sound = pygame.mixer.Sound('res/sound/repair.ogg')
+            self.repair_sound = sound.get('res/sound/repair.ogg')
 
         def draw(self, cam: camera.Camera):
             cam.blit(
@@ -219,12 +216,14 @@ class DamageSpot(Interactable):
             self.anim_tex.tick(dt)
 
         def interact(self, user: pirate.Pirate):
-            if user.held_item_idx != -1:
-                if user.manager.items[user.held_item_idx].fixes_damage():
-                    user.manager.items[user.held_item_idx].removal_mark = True
+            held = user.held_item()
+            if held is not None:
+                if held.fixes_damage():
+                    held.removal_mark = True
                     user.manager.interactables[self.idx].removal_mark = True
                     user.manager.boat_health += self.damage
                     self.repair_sound.play()
 
         def can_highlight(self, user: pirate.Pirate) -> bool:
-            return super().can_highlight(user) and user.held_item_idx != -1 and user.manager.items[user.held_item_idx].fixes_damage()
\ No newline at end of file
+            held = user.held_item()
+            return super().can_highlight(user) and held is not None and held.fixes_damage()
\ No newline at end of file
@@ -6,11 +6,14 @@ from src import event
 from src import consts
 from src.render import camera
 from src.render import spritesheet
+from src.render import animate
 from src.game import fireable
 from src.game import pirate
 from src.game import interact
 
 class Item(fireable.Fireable):
+    __slots__ = ('texture', 'frames', 'position', 'id', 'flip_texture', 'held', 'removal_mark', 'rotation', 'random_variance')
+
     type _ItemEntry = tuple[
         tuple[int, int], # tilesheet pos
         str, # name
@@ -34,13 +37,25 @@ class Item(fireable.Fireable):
         ((6, 0), "Jar of Dirt", 5, True, False, False, False, True, True, True),
     ]
 
+    FRAMES: dict[str, tuple[int, list[tuple[int, int]]]] = {
+        entry[1]: (1, [entry[0]]) for entry in ITEMS
+    }
+
     
 
-    def __init__(self, id: int, pos: pygame.Vector2 = pygame.Vector2()) -> None:
+    def __init__(self, id: int, pos: pygame.Vector2 | None = None) -> None:
         super().__init__()
-        self.position = pos
-        self.id = id
         self.texture = spritesheet.Spritesheet(util.load_texture('res/items.png'))
+        self.frames = animate.FrameTable.compile(self.texture, Item.FRAMES)
+        self.reset(id, pos)
+
+    def reset(self, id: int, pos: pygame.Vector2 | None = None):
+        # also used by the manager's item pool to recycle a dead instance
+        self.position = pygame.Vector2() if pos is None else pos
+        self.id = id
+        self.hidden = False
+        self.fired = False
+        self.fired_up = True
         self.flip_texture = False
         self.held = False
         self.removal_mark = False
@@ -49,12 +64,10 @@ class Item(fireable.Fireable):
 
     def draw(self, cam: camera.Camera):
         if not self.hidden:
-            cam.blit(pygame.transform.flip(self.texture.get_cell(*Item.ITEMS[self.id][0]), self.flip_texture, False), self.position, rotation=self.rotation, scale=consts.DRAW_SCALE, zindex=1 if self.held else -1)
+            cam.blit(self.frames.frames[self.name()][1 if self.flip_texture else 0][0], self.position, rotation=self.rotation, scale=consts.DRAW_SCALE, zindex=1 if self.held else -1)
 
     def update(self, dt: float, cam: camera.Camera):
-        if self.fired:
-            self.position.y -= fireable.Fireable.FIRE_SPEED * dt * (1 if self.fired_up else -1)
-            self.rotation += fireable.Fireable.FIRE_ROT_SPEED * dt
+        pass
 
     def can_be_picked_up(self) -> bool:
         return not self.held and not self.fired and not self.hidden and not self.removal_mark
@@ -81,16 +94,27 @@ class Item(fireable.Fireable):
         return Item.ITEMS[self.id][7]
     
     def ai_picks_up(self) -> bool:
-        return Item.ITEMS[self.id][8]
+        return Item.id_ai_picks_up(self.id)
     
     def in_barrels(self) -> bool:
-        return Item.ITEMS[self.id][9]
+        return Item.id_in_barrels(self.id)
+
+    @classmethod
+    def id_ai_picks_up(cls, id: int) -> bool:
+        return cls.ITEMS[id][8]
+
+    @classmethod
+    def id_in_barrels(cls, id: int) -> bool:
+        return cls.ITEMS[id][9]
     
     def set_position(self, position: pygame.Vector2):
         self.position = position
 
     def fire(self, firer: pirate.Pirate, cannon: interact.Cannon):
-        super().fire(firer, cannon)
+        # in flight the item only lives in the manager's projectile arrays
+        self.cannon_sound.play()
+        self.removal_mark = True
+        firer.manager.projectiles.spawn(self.id, cannon.position - pygame.Vector2(0, consts.DRAW_SCALE * 4), fired_up=True, random_variance=self.random_variance, rotation=self.rotation)
     
     
 
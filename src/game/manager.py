@@ -1,32 +1,55 @@
 import pygame
+import numpy as np
 import typing
 import random
 
 from src import consts
 from src import event
+from src import sound
+from src import trace
 from src.render import camera
 from src.render import text
+from src.render import hud
 from src.game import pirate
 from src.game import ship
 from src.game import interact
 from src.game import item
+from src.game import spatial
+from src.game import projectile
+from src.game import pool
+from src.game import brain
+from src.game import navigation
 from src.menu import win
 from src.menu import lose
 
 type _Collider = pygame.Rect | interact.Interactable
 
 class GameManager():
+    # interactables npcs walk up to, each gets a flow field
+    NAV_GOALS: tuple[type[interact.Interactable], ...] = (interact.Cannon, interact.ItemBarrel, interact.DamageSpot)
+
     def __init__(self, cam: camera.Camera) -> None:
         self.camera = cam
 
         self.ship_map = ship.Ship()
         self.active_pirates: list[pirate.Pirate] = [pirate.NPCPirate(self, self.ship_map.get_tile_center(self.camera, 15 + i * (-1 if i % 2 == 0 else 1), 3)) for i in range(7)]
         
-        self._next_item_idx: int = 0
-        self.items: dict[int, item.Item] = {} 
+        self.items: pool.Pool[item.Item] = pool.Pool()
+        self.projectiles = projectile.ProjectileSystem()
         
+        self.ai = brain.BrainScheduler()
+
+        # ship colliders use negative keys, interactables their own idx
+        self.collision_index: spatial.SpatialHash[int] = spatial.SpatialHash()
+        for i, rect in enumerate(self.ship_map.map_colliders):
+            self.collision_index.insert(-1 - i, rect)
+        self.nav: navigation.NavGrid[int] = navigation.NavGrid(self.ship_map.map_bounds, self.ship_map.map_colliders)
+
         self._next_interactable_idx: int = 0
         self.interactables: dict[int, interact.Interactable] = {}
+        # per class (and every interactable base class), in insertion order like a scan of interactables
+        self.interactables_by_type: dict[type[interact.Interactable], dict[int, None]] = {}
+        self.interactable_points: spatial.PointHash[int] = spatial.PointHash()
         self.add_interactables()
 
         self.player = pirate.PlayerPirate(self, self.ship_map.get_tile_center(cam, 15, 3))
@@ -42,20 +65,62 @@ class GameManager():
 
         self.next_enemy_fire: float = 0.0
 
-        self.damage_sound = pygame.mixer.Sound('res/sound/damage.ogg')
+        self.damage_sound = sound.get('res/sound/damage.ogg')
+
+        self.hud = hud.Hud()
+        self.hud_team = self.hud.add(hud.TextWidget(text.glyphxel(), 2, pygame.Vector2(consts.CANVAS_DIMS[0]/2, 25), 0x005f41, centered=True))
+        self.hud_enemy = self.hud.add(hud.TextWidget(text.glyphxel(), 2, pygame.Vector2(consts.CANVAS_DIMS[0]/2, 65), 0x720d0d, centered=True))
+        self.hud_held = self.hud.add(hud.TextWidget(text.glyphxel(), 2, pygame.Vector2(20, 20)))
+        self.hud_prompt = self.hud.add(hud.TextWidget(text.glyphxel(), 2, pygame.Vector2(20, 60)))
+        self.hud_scurvy = self.hud.add(hud.BarWidget('Scurvy-o-meter: ', 0xecab11, pygame.Vector2(consts.CANVAS_DIMS[0] - 470, 8), pygame.Vector2(250, 12)))
+        self.hud_drunk = self.hud.add(hud.BarWidget('Drunk-o-meter: ', 0xc12458, pygame.Vector2(consts.CANVAS_DIMS[0] - 455, 68), pygame.Vector2(235, 12)))
 
     def add_item(self, item: item.Item) -> int:
-        self.items[self._next_item_idx] = item
-        self._next_item_idx += 1
-        return self._next_item_idx - 1
+        return self.items.add(item)
+
+    def spawn_item(self, id: int, pos: pygame.Vector2 | None = None) -> int:
+        # a fresh vector per spawn, pooled items must never share one
+        if pos is None:
+            pos = pygame.Vector2()
+        return self.items.spawn(lambda: item.Item(id, pos), lambda i: i.reset(id, pos))
     
     def add_interactable(self, interactable: interact.Interactable):
-        self.interactables[self._next_interactable_idx] = interactable
+        idx = self._next_interactable_idx
+        self.interactables[idx] = interactable
+        self.collision_index.insert(idx, interactable.collider)
+        self.interactable_points.insert(idx, interactable.position)
+        # the obstacle itself is registered by _update once the interactable has computed its collider
+        if isinstance(interactable, GameManager.NAV_GOALS):
+            self.nav.add_goal(idx, interactable.position)
+        for cls in GameManager.interactable_types(interactable):
+            self.interactables_by_type.setdefault(cls, {})[idx] = None
         self._next_interactable_idx += 1
 
     def add_interactable_idx(self, f: typing.Callable[[int], interact.Interactable]):
-        self.interactables[self._next_interactable_idx] = f(self._next_interactable_idx)
-        self._next_interactable_idx += 1
+        self.add_interactable(f(self._next_interactable_idx))
+
+    def remove_interactable(self, idx: int):
+        interactable = self.interactables.pop(idx)
+        self.collision_index.remove(idx)
+        self.interactable_points.remove(idx)
+        self.nav.remove_obstacle(idx)
+        self.nav.remove_goal(idx)
+        for cls in GameManager.interactable_types(interactable):
+            self.interactables_by_type[cls].pop(idx, None)
+
+    def interactables_of(self, cls: type[interact.Interactable]) -> list[int]:
+        return list(self.interactables_by_type.get(cls, ()))
+
+    def count_interactables_of(self, cls: type[interact.Interactable]) -> int:
+        return len(self.interactables_by_type.get(cls, ()))
+
+    def closest_interactable(self, pos: pygame.Vector2, accept: typing.Callable[[interact.Interactable], bool] | None = None) -> int:
+        idx = self.interactable_points.nearest(pos, None if accept is None else lambda i: accept(self.interactables[i]))
+        return -1 if idx is None else idx
+
+    @staticmethod
+    def interactable_types(interactable: interact.Interactable) -> list[type[interact.Interactable]]:
+        return [cls for cls in type(interactable).__mro__ if issubclass(cls, interact.Interactable)]
 
     def add_interactables(self):
         # cannons
@@ -75,8 +140,10 @@ class GameManager():
         for pirate in self.active_pirates:
             pirate.draw(cam)
 
-        for idx in self.items:
-            self.items[idx].draw(cam)
+        for i in self.items.values():
+            i.draw(cam)
+
+        self.projectiles.draw(cam)
 
         for idx in self.interactables:
             self.interactables[idx].draw(cam)
@@ -88,98 +155,74 @@ class GameManager():
         if self.boat_health <= 25:
             pos_mod = pygame.Vector2(random.uniform(-5, 5), random.uniform(-5, 5))
 
-        cam.with_zindex_blit(
-                (
-                    text.glyphxel().render_adv(f"{self.team_name} (Good Guys): {self.boat_health:.1f}% ship integrity", 2, color=0x005f41),
-                    pygame.Vector2(consts.CANVAS_DIMS[0]/2, 25) + pos_mod
-                ), centered=True, zindex=consts.HUD_LAYER
-            )
-        
-        cam.with_zindex_blit(
-                (
-                    text.glyphxel().render_adv(f"{self.enemy_team_name} (Bad Guys): {self.enemy_health:.1f}% ship integrity", 2, color=0x720d0d),
-                    pygame.Vector2(consts.CANVAS_DIMS[0]/2, 65)
-                ), centered=True, zindex=consts.HUD_LAYER
-            )
+        self.hud_team.set(f"{self.team_name} (Good Guys): {self.boat_health:.1f}% ship integrity")
+        self.hud_team.draw(cam, pos_mod)
+
+        self.hud_enemy.set(f"{self.enemy_team_name} (Bad Guys): {self.enemy_health:.1f}% ship integrity")
+        self.hud_enemy.draw(cam)
     
         self.draw_scurvy_bar(cam)
         self.draw_drunk_bar(cam)
 
-        if self.player.held_item_idx != -1:
-            cam.with_zindex_blit(
-                (
-                    text.glyphxel().render_adv(f"Held Item: {self.items[self.player.held_item_idx].name()}", 2),
-                    pygame.Vector2(20, 20)
-                ), zindex=consts.HUD_LAYER
-            )
-            if self.items[self.player.held_item_idx].gets_you_drunk():
-                cam.with_zindex_blit(
-                (
-                    text.glyphxel().render_adv(f"Press E to drink", 2),
-                    pygame.Vector2(20, 60)
-                ), zindex=consts.HUD_LAYER
-            )
-            if self.items[self.player.held_item_idx].cures_scurvy():
-                cam.with_zindex_blit(
-                (
-                    text.glyphxel().render_adv(f"Press E to eat", 2),
-                    pygame.Vector2(20, 60)
-                ), zindex=consts.HUD_LAYER
-            )
+        held = self.player.held_item()
+        if held is not None:
+            self.hud_held.set(f"Held Item: {held.name()}")
+            if held.cures_scurvy():
+                self.hud_prompt.set("Press E to eat")
+            elif held.gets_you_drunk():
+                self.hud_prompt.set("Press E to drink")
+            else:
+                self.hud_prompt.set("")
         else:
-            cam.with_zindex_blit(
-                (
-                    text.glyphxel().render_adv(f"Press <space> to interact", 2),
-                    pygame.Vector2(20, 20)
-                ), zindex=consts.HUD_LAYER
-            )
+            self.hud_held.set("Press <space> to interact")
+            self.hud_prompt.set("")
+
+        self.hud_held.draw(cam)
+        self.hud_prompt.draw(cam)
 
     def update(self, dt: float, cam: camera.Camera):
+        with trace.span('GameManager.update'):
+            self._update(dt, cam)
+
+    def _update(self, dt: float, cam: camera.Camera):
         self.try_random_enemy_fire(dt)
-        
-        for pirate in self.active_pirates:
-            pirate.update(dt, cam)
+
+        npcs = [p for p in self.active_pirates if isinstance(p, pirate.NPCPirate)]
+        self.ai.begin_frame(npcs)
+        if consts.BATCHED_NPC_MOVEMENT:
+            pirate.NPCPirate.steer_batch([p for p in npcs if not p.hidden and not p.fired and p.can_move], dt)
+
+        for p in self.active_pirates:
+            p.update(dt, cam)
+
+        self.land_projectiles(self.projectiles.update(dt))
 
         r: list[int] = []
-        for idx in self.items:
-            self.items[idx].update(dt, cam)
-            if self.items[idx].fired:
-                if (self.items[idx].fired_up and self.items[idx].position.y < -600) or (not self.items[idx].fired_up and self.items[idx].position.y > 250 + (self.items[idx].random_variance - 0.5) * 180):
-                    
-                    if self.items[idx].causes_damage():
-                        self.items[idx].removal_mark = True
-                    else:
-                        self.items[idx].fired = False
-                        self.items[idx].rotation = 0.0
-
-                    damage = random.uniform(1, 5) * self.items[idx].damage_mult()
-
-                    if self.items[idx].fired_up:
-                        self.enemy_health -= damage
-                    else:
-                        self.boat_health -= damage
-
-                        if self.items[idx].causes_damage():
-                            self.add_interactable_idx(lambda i: interact.DamageSpot(i, damage, self.items[idx].position.copy()))
-                            self.damage_sound.play()
-
-            if self.items[idx].removal_mark:
+        for idx, i in self.items.items():
+            i.update(dt, cam)
+            if i.removal_mark:
                 r.append(idx)
 
-        for i in r:
-            if self.items[i].held:
+        for idx in r:
+            if self.items[idx].held:
                 for p in self.active_pirates:
-                    if p.held_item_idx == i:
+                    if p.held_item_idx == idx:
                         p.held_item_idx = -1
-            del self.items[i]
+            self.items.remove(idx)
 
         r = []
         for idx in self.interactables:
             self.interactables[idx].update(dt, cam)
+            collider = self.interactables[idx].collider
+            if collider != self.collision_index.rects[idx]:
+                self.collision_index.update(idx, collider)
+                self.nav.set_obstacle(idx, collider)
+            self.interactable_points.move(idx, self.interactables[idx].position)
             if self.interactables[idx].removal_mark:
                 r.append(idx)
         for i in r:
-            del self.interactables[i]
+            self.remove_interactable(i)
+        self.nav.refresh()
 
         self.ship_map.update(dt, cam)
 
@@ -201,8 +244,42 @@ class GameManager():
 
         
 
+    def land_projectiles(self, landings: projectile.Landings):
+        if len(landings) <= 0:
+            return
+
+        up = landings.fired_up
+        self.enemy_health -= float(landings.damage[up].sum())
+        self.boat_health -= float(landings.damage[~up].sum())
+
+        for i in np.flatnonzero(~up):
+            id = int(landings.item_id[i])
+            pos = pygame.Vector2(float(landings.position[i, 0]), float(landings.position[i, 1]))
+
+            if self.projectiles.causes_damage[id]:
+                damage = float(landings.damage[i])
+                self.add_interactable_idx(lambda idx: interact.DamageSpot(idx, damage, pos))
+                self.damage_sound.play()
+            else:
+                # harmless enemy fire lands on deck as a regular item
+                self.spawn_item(id, pos)
+
+    def entity_counts(self) -> dict[str, int]:
+        return {
+            'pirates': len(self.active_pirates),
+            'items': len(self.items),
+            'projectiles': self.projectiles.count,
+            'interactables': len(self.interactables),
+        }
+
     def fetch_all_colliders(self) -> list[_Collider]:
         return self.ship_map.map_colliders + list(self.interactables.values())
+
+    def query_colliders(self, rect: pygame.Rect) -> list[_Collider]:
+        return [
+            self.ship_map.map_colliders[-1 - key] if key < 0 else self.interactables[key]
+            for key in self.collision_index.query(rect)
+        ]
     
     def collider_rect(self, collider: _Collider) -> pygame.Rect:
         if isinstance(collider, pygame.Rect):
@@ -219,10 +296,7 @@ class GameManager():
 
         if self.next_enemy_fire <= 0:    
             x = self.ship_map.get_tile_center(self.camera, random.uniform(1, 30), 0).x
-            i = item.Item(random.randint(0 , len(item.Item.ITEMS) - 1), pygame.Vector2(x, -800))
-            i.fired = True
-            i.fired_up = False
-            self.add_item(i)
+            self.projectiles.spawn(random.randint(0 , len(item.Item.ITEMS) - 1), pygame.Vector2(x, -800), fired_up=False)
             self.next_enemy_fire = random.uniform(0.5, 4)
 
     def draw_scurvy_bar(self, cam: camera.Camera):
@@ -230,65 +304,12 @@ class GameManager():
         if self.player.scurvy_time <= pirate.Pirate.SCURVY_WARNING_TIME:
             pos_mod = pygame.Vector2(random.uniform(-5, 5), random.uniform(-5, 5))
 
-        cam.with_zindex(
-                lambda s: pygame.draw.rect(s, 0x000000,
-                    pygame.Rect(
-                        pygame.Vector2(consts.CANVAS_DIMS[0] - 220, 20) + pos_mod,
-                        pygame.Vector2(200, 20),
-                    )
-                ), zindex=consts.HUD_LAYER
-            )
-        cam.with_zindex(
-                lambda s: s.blit(text.glyphxel().render_adv('Scurvy-o-meter: ', 2, 0x0),
-                                 pygame.Vector2(consts.CANVAS_DIMS[0] - 470, 8) + pos_mod), zindex=consts.HUD_LAYER
-            )
-        cam.with_zindex(
-            lambda s: pygame.draw.rect(s, 0xffffff,
-                pygame.Rect(
-                        pygame.Vector2(consts.CANVAS_DIMS[0] - 215, 25) + pos_mod,
-                        pygame.Vector2(190, 10),
-                    )
-            ), zindex=consts.HUD_LAYER
-        )
-        cam.with_zindex(
-            lambda s: pygame.draw.rect(s, 0xecab11,
-                pygame.Rect(
-                        pygame.Vector2(consts.CANVAS_DIMS[0] - 215, 25) + pos_mod,
-                        pygame.Vector2(190 * (self.player.scurvy_time / pirate.Pirate.SCURVY_TIME), 10),
-                    )
-            ), zindex=consts.HUD_LAYER
-        )
+        self.hud_scurvy.set_fill(self.player.scurvy_time / pirate.Pirate.SCURVY_TIME)
+        self.hud_scurvy.draw(cam, pos_mod)
 
     def draw_drunk_bar(self, cam: camera.Camera):
-
-        cam.with_zindex(
-                lambda s: pygame.draw.rect(s, 0x000000,
-                    pygame.Rect(
-                        pygame.Vector2(consts.CANVAS_DIMS[0] - 220, 80),
-                        pygame.Vector2(200, 20),
-                    )
-                ), zindex=consts.HUD_LAYER
-            )
-        cam.with_zindex(
-                lambda s: s.blit(text.glyphxel().render_adv('Drunk-o-meter: ', 2, 0x0),
-                                 pygame.Vector2(consts.CANVAS_DIMS[0] - 455, 68)), zindex=consts.HUD_LAYER
-            )
-        cam.with_zindex(
-            lambda s: pygame.draw.rect(s, 0xffffff,
-                pygame.Rect(
-                        pygame.Vector2(consts.CANVAS_DIMS[0] - 215, 85),
-                        pygame.Vector2(190, 10),
-                    )
-            ), zindex=consts.HUD_LAYER
-        )
-        cam.with_zindex(
-            lambda s: pygame.draw.rect(s, 0xc12458,
-                pygame.Rect(
-                        pygame.Vector2(consts.CANVAS_DIMS[0] - 215, 85),
-                        pygame.Vector2(190 * (self.player.drunk_time / pirate.Pirate.MAX_DRUNK_TIME), 10),
-                    )
-            ), zindex=consts.HUD_LAYER
-        )
+        self.hud_drunk.set_fill(self.player.drunk_time / pirate.Pirate.MAX_DRUNK_TIME)
+        self.hud_drunk.draw(cam)
 
     @staticmethod
     def resolve_team_name(prefix: int, suffix: int) -> str:
@@ -0,0 +1,239 @@
+import pygame
+import numpy as np
+import typing
+
+from src import consts
+
+class NavGrid[K]():
+    # 4-neighbour bfs distances, then each cell steps to its lowest 8-neighbour without cutting corners
+    ORTHOGONAL: tuple[tuple[int, int], ...] = ((0, -1), (-1, 0), (1, 0), (0, 1))
+    DIAGONAL: tuple[tuple[int, int], ...] = ((-1, -1), (1, -1), (-1, 1), (1, 1))
+    UNREACHED: int = np.iinfo(np.int32).max
+
+    builds_total: int = 0
+
+    def __init__(self, bounds: pygame.Rect, static: list[pygame.Rect], cell_size: int = consts.NAV_CELL_SIZE, clearance: int = consts.NAV_CLEARANCE, goal_radius: float = consts.NAV_GOAL_RADIUS, target_bucket: int = consts.NAV_TARGET_BUCKET, target_field_entries: int = consts.NAV_TARGET_FIELD_ENTRIES, build_budget: int = consts.NAV_BUILD_BUDGET) -> None:
+        self.bounds = pygame.Rect(bounds)
+        self.cell_size = cell_size
+        self.clearance = clearance
+        self.goal_radius = goal_radius
+
+        self.cols = max(1, -(-self.bounds.w // cell_size))
+        self.rows = max(1, -(-self.bounds.h // cell_size))
+        self.centres_x = self.bounds.x + (np.arange(self.cols) + 0.5) * cell_size
+        self.centres_y = self.bounds.y + (np.arange(self.rows) + 0.5) * cell_size
+
+        # plain positions share a field per bucket of cells, which keeps the number of such fields small
+        self.target_bucket = target_bucket
+        self.bucket_cols = -(-self.cols // target_bucket)
+
+        # how many obstacles cover each cell, so overlapping obstacles can come and go independently
+        self.blockers = np.zeros(self.rows * self.cols, dtype=np.int16)
+        for rect in static:
+            self.blockers[self.cells_under(rect)] += 1
+
+        self.obstacles: dict[K, tuple[pygame.Rect, np.ndarray]] = {}
+        self.goals: dict[K, pygame.Vector2] = {}
+        # per goal, the flat index of the cell to head for next, -1 where the goal is walked to directly
+        self.fields: dict[K, np.ndarray] = {}
+        self.dirty: dict[K, None] = {}
+        # fields to plain positions per target bucket, most recently used last
+        self.target_fields: dict[int, np.ndarray] = {}
+        self.target_field_entries = target_field_entries
+        # target buckets asked for but not built yet, oldest first
+        self.pending: dict[int, None] = {}
+
+        # builds are spread over frames, build_budget bfs rings per refresh
+        self.build_budget = build_budget
+        self.job: tuple[K | None, int, typing.Generator[None, None, np.ndarray]] | None = None
+
+        self.builds = 0
+
+    def cell_of(self, pos: pygame.Vector2) -> int:
+        c = int((pos.x - self.bounds.x) // self.cell_size)
+        r = int((pos.y - self.bounds.y) // self.cell_size)
+        if c < 0 or r < 0 or c >= self.cols or r >= self.rows:
+            return -1
+        return r * self.cols + c
+
+    def cells_under(self, rect: pygame.Rect) -> np.ndarray:
+        # a cell is covered when a pirate centred on it would overlap the rect
+        if rect.w <= 0 or rect.h <= 0:
+            return np.zeros(0, dtype=np.intp)
+        grown = rect.inflate(self.clearance * 2, self.clearance * 2)
+        cols = np.flatnonzero((self.centres_x >= grown.left) & (self.centres_x < grown.right))
+        rows = np.flatnonzero((self.centres_y >= grown.top) & (self.centres_y < grown.bottom))
+        return (rows[:, None] * self.cols + cols[None, :]).ravel()
+
+    def set_obstacle(self, key: K, rect: pygame.Rect):
+        old = self.obstacles.get(key)
+        if old is not None and old[0] == rect:
+            return
+
+        blocked = self.blockers > 0
+        if old is not None:
+            self.blockers[old[1]] -= 1
+        cells = self.cells_under(rect)
+        self.blockers[cells] += 1
+        self.obstacles[key] = (pygame.Rect(rect), cells)
+
+        if not np.array_equal(blocked, self.blockers > 0):
+            self.invalidate()
+
+    def remove_obstacle(self, key: K):
+        old = self.obstacles.pop(key, None)
+        if old is None:
+            return
+
+        blocked = self.blockers > 0
+        self.blockers[old[1]] -= 1
+        if not np.array_equal(blocked, self.blockers > 0):
+            self.invalidate()
+
+    def invalidate(self):
+        # goal fields keep routing on their old layout until their rebuild comes up
+        self.dirty.update(dict.fromkeys(self.goals))
+        self.target_fields.clear()
+        self.job = None
+
+    def add_goal(self, key: K, pos: pygame.Vector2):
+        # built by refresh, until then the goal is walked to directly
+        self.goals[key] = pos.copy()
+        self.dirty[key] = None
+
+    def remove_goal(self, key: K):
+        self.goals.pop(key, None)
+        self.fields.pop(key, None)
+        self.dirty.pop(key, None)
+
+    def refresh(self):
+        # the only place fields are built, goal fields before plain targets
+        rings = self.build_budget
+        while rings > 0:
+            if self.job is None:
+                self.job = self.next_job()
+                if self.job is None:
+                    return
+
+            key, bucket, steps = self.job
+            try:
+                next(steps)
+                rings -= 1
+            except StopIteration as done:
+                self.job = None
+                if key is not None:
+                    if key in self.goals:
+                        self.fields[key] = done.value
+                else:
+                    if len(self.target_fields) >= self.target_field_entries:
+                        del self.target_fields[next(iter(self.target_fields))]
+                    self.target_fields[bucket] = done.value
+
+    def next_job(self) -> tuple[K | None, int, typing.Generator[None, None, np.ndarray]] | None:
+        if self.dirty:
+            key = next(iter(self.dirty))
+            del self.dirty[key]
+            return key, -1, self.build(self.goals[key])
+        if self.pending:
+            bucket = next(iter(self.pending))
+            del self.pending[bucket]
+            return None, bucket, self.build(self.bucket_centre(bucket))
+        return None
+
+    def waypoint(self, key: K, pos: pygame.Vector2) -> pygame.Vector2 | None:
+        # None means there is nothing to route around, so head straight for the goal
+        return self.step(self.fields.get(key), pos)
+
+    def waypoint_to(self, target: pygame.Vector2, pos: pygame.Vector2) -> pygame.Vector2 | None:
+        goal = self.bucket_of(target)
+        if goal == -1:
+            return None
+
+        field = self.target_fields.pop(goal, None)
+        if field is None:
+            # never built here, a miss is queued for refresh and walked straight meanwhile
+            if goal not in self.pending:
+                if len(self.pending) >= self.target_field_entries:
+                    del self.pending[next(iter(self.pending))]
+                self.pending[goal] = None
+            return None
+        self.target_fields[goal] = field
+        return self.step(field, pos)
+
+    def bucket_of(self, pos: pygame.Vector2) -> int:
+        cell = self.cell_of(pos)
+        if cell == -1:
+            return -1
+        r, c = divmod(cell, self.cols)
+        return (r // self.target_bucket) * self.bucket_cols + c // self.target_bucket
+
+    def bucket_centre(self, bucket: int) -> pygame.Vector2:
+        r, c = divmod(bucket, self.bucket_cols)
+        b, cs = self.target_bucket, self.cell_size
+        return pygame.Vector2(
+            self.bounds.x + (c * b + min((c + 1) * b, self.cols)) * cs / 2,
+            self.bounds.y + (r * b + min((r + 1) * b, self.rows)) * cs / 2
+        )
+
+    def step(self, field: np.ndarray | None, pos: pygame.Vector2) -> pygame.Vector2 | None:
+        if field is None:
+            return None
+        cell = self.cell_of(pos)
+        if cell == -1:
+            return None
+        step = int(field[cell])
+        if step == -1:
+            return None
+        return pygame.Vector2(float(self.centres_x[step % self.cols]), float(self.centres_y[step // self.cols]))
+
+    def build(self, goal: pygame.Vector2) -> typing.Generator[None, None, np.ndarray]:
+        # yields after every bfs ring, the field comes back as the generator's return value
+        self.builds += 1
+        NavGrid.builds_total += 1
+
+        rows, cols = self.rows, self.cols
+
+        # padded by one closed cell so every neighbour lookup is a plain slice
+        open_ = np.zeros((rows + 2, cols + 2), dtype=bool)
+        open_[1:-1, 1:-1] = (self.blockers == 0).reshape(rows, cols)
+
+        def shifted(a: np.ndarray, dx: int, dy: int) -> np.ndarray:
+            return a[1 + dy:rows + 1 + dy, 1 + dx:cols + 1 + dx]
+
+        frontier = np.zeros((rows + 2, cols + 2), dtype=bool)
+        seeds = shifted(frontier, 0, 0)
+        seeds[:] = ((self.centres_x[None, :] - goal.x) ** 2 + (self.centres_y[:, None] - goal.y) ** 2 <= self.goal_radius ** 2) & shifted(open_, 0, 0)
+        if not seeds.any():
+            cell = self.cell_of(goal)
+            if cell != -1:
+                seeds[cell // cols, cell % cols] = True
+
+        # bfs a whole ring at a time
+        grid = np.full((rows + 2, cols + 2), NavGrid.UNREACHED, dtype=np.int32)
+        grid[frontier] = 0
+        d = 0
+        while frontier.any():
+            d += 1
+            grown = np.zeros_like(frontier)
+            shifted(grown, 0, 0)[:] = shifted(frontier, 0, -1) | shifted(frontier, -1, 0) | shifted(frontier, 1, 0) | shifted(frontier, 0, 1)
+            frontier = grown & open_ & (grid == NavGrid.UNREACHED)
+            grid[frontier] = d
+            yield
+
+        offsets = NavGrid.ORTHOGONAL + NavGrid.DIAGONAL
+        candidates = np.empty((len(offsets), rows, cols), dtype=np.int32)
+        for k, (dx, dy) in enumerate(offsets):
+            candidate = shifted(grid, dx, dy)
+            if dx != 0 and dy != 0:
+                candidate = np.where(shifted(open_, dx, 0) & shifted(open_, 0, dy), candidate, NavGrid.UNREACHED)
+            candidates[k] = candidate
+
+        # argmin takes the first of equal distances, so straight steps win ties over diagonals
+        best = candidates.argmin(axis=0)
+        best_dist = np.take_along_axis(candidates, best[None], axis=0)[0]
+        moves = best_dist < shifted(grid, 0, 0)
+
+        r, c = np.indices((rows, cols))
+        dx = np.array([dx for dx, _ in offsets])[best]
+        dy = np.array([dy for _, dy in offsets])[best]
+        return np.where(moves, (r + dy) * cols + (c + dx), -1).ravel().astype(np.int32)
@@ -3,10 +3,12 @@ import pygame
 import random
 import typing
 import math
+import numpy as np
 
 from src import util
 from src import consts
 from src import event
+from src import sound
 from src.render import spritesheet
 from src.render import camera
 from src.render import animate
@@ -20,6 +22,8 @@ from src.menu import lose
 from src.game import manager
 
 class Pirate(fireable.Fireable):
+    __slots__ = ('position', 'speed', 'sprite_rotation', 'reach', 'crouched', 'update_anim', 'held_item_idx', 'collision_box', 'drunk_time', 'scurvy_time', 'can_move', 'manager', 'anim_tex', 'drunk_bubbles', 'pickup_sound', 'drink_sound', 'eat_sound', 'scurvy_sound', 'pending_movement', 'pending_displacement')
+
     ANIM_IDLE: str = 'idle'
     ANIM_RUN: str = 'run'
     ANIM_CROUCH: str = 'crouch'
@@ -47,6 +51,10 @@ class Pirate(fireable.Fireable):
         self.scurvy_time: float = Pirate.SCURVY_TIME
         self.can_move = True
 
+        # filled in by a batched steering pass ahead of update, None means steer here
+        self.pending_movement: pygame.Vector2 | None = None
+        self.pending_displacement: pygame.Vector2 | None = None
+
         self.manager = manager
 
         self.anim_tex = animate.AnimatedTexture(spritesheet.Spritesheet(util.load_texture('res/pirate.png')), {
@@ -76,10 +84,10 @@ class Pirate(fireable.Fireable):
             '' : (4, [(2, 4), (3, 4), (4, 4)])
         })
 
-        self.pickup_sound = pygame.mixer.Sound('res/sound/pickup.ogg')
-        self.drink_sound = pygame.mixer.Sound('res/sound/drink.ogg')
-        self.eat_sound = pygame.mixer.Sound('res/sound/eat.ogg')
-        self.scurvy_sound = pygame.mixer.Sound('res/sound/scurvy.ogg')
+        self.pickup_sound = sound.get('res/sound/pickup.ogg')
+        self.drink_sound = sound.get('res/sound/drink.ogg')
+        self.eat_sound = sound.get('res/sound/eat.ogg')
+        self.scurvy_sound = sound.get('res/sound/scurvy.ogg')
 
     def draw(self, cam: camera.Camera):
         if self.hidden:
@@ -99,11 +107,12 @@ class Pirate(fireable.Fireable):
             )
 
         if consts.DRAW_COLLISION_BOXES:
-            cam.with_zindex(lambda s: pygame.draw.rect(s, 'red', cam.w2s_r(self.collision_box), 8), 10)
+            cam.draw_rect('red', cam.w2s_r(self.collision_box), 8, 10)
 
-        if self.held_item_idx != -1:
-            self.manager.items[self.held_item_idx].flip_texture = self.anim_tex.flipped
-            self.manager.items[self.held_item_idx].position = self.position + pygame.Vector2(8 * (-1 if self.anim_tex.flipped else 1), -8 * consts.DRAW_SCALE)
+        held = self.held_item()
+        if held is not None:
+            held.flip_texture = self.anim_tex.flipped
+            held.position = self.position + pygame.Vector2(8 * (-1 if self.anim_tex.flipped else 1), -8 * consts.DRAW_SCALE)
 
     def update(self, dt: float, cam: camera.Camera):
         if self.hidden:
@@ -124,15 +133,17 @@ class Pirate(fireable.Fireable):
             if not self.can_move:
                 return
             
-            movement = self.get_movement(dt)
+            movement = self.pending_movement
+            if movement is None:
+                movement = self.get_movement(dt)
 
-            if self.drunk_time > 0:
-                if movement.length() != 0:
-                    direction = movement.normalize().yx
-                    movement += direction * math.sin(self.drunk_time * 10) * 0.3
-                self.drunk_time -= dt
+                if self.drunk_time > 0:
+                    if movement.length() != 0:
+                        direction = movement.normalize().yx
+                        movement += direction * math.sin(self.drunk_time * 10) * 0.3
+                    self.drunk_time -= dt
 
-                self.drunk_time = min(self.drunk_time, Pirate.MAX_DRUNK_TIME)
+                    self.drunk_time = min(self.drunk_time, Pirate.MAX_DRUNK_TIME)
 
             self.scurvy_time -= dt * (0.5 if self.drunk_time > 0.0 else 1)
             if round(self.scurvy_time) == Pirate.SCURVY_WARNING_TIME:
@@ -165,10 +176,15 @@ class Pirate(fireable.Fireable):
 
             self.collision_box = self.anim_tex.get_frame().get_rect(center=self.position).scale_by(consts.DRAW_SCALE)
 
-            self.position += movement.elementwise() * dt * self.speed * (0.6 if self.crouched or self.held_item_idx != -1 else 1) * (1.8 if self.drunk_time > 0 else 1)
+            if self.pending_displacement is None:
+                self.position += movement.elementwise() * dt * self.speed * (0.6 if self.crouched or self.held_item_idx != -1 else 1) * (1.8 if self.drunk_time > 0 else 1)
+            else:
+                self.position += self.pending_displacement
+            self.pending_movement = None
+            self.pending_displacement = None
 
             if self.manager is not None:
-                for collider in self.manager.fetch_all_colliders():
+                for collider in self.manager.query_colliders(self.collision_box):
                     rect = self.manager.collider_rect(collider)
                     if pygame.Vector2(rect.center).distance_squared_to(self.position) < 20000:
                         resolution = util.resolve_collision(rect, self.collision_box)
@@ -182,9 +198,7 @@ class Pirate(fireable.Fireable):
         self.position = position
 
     def closest_interactable_idx(self) -> int:
-        if len(self.manager.interactables) <= 0:
-            return -1
-        return sorted(filter(lambda i: self.manager.interactables[i].can_highlight(self), self.manager.interactables), key=lambda idx: self.position.distance_squared_to(self.manager.interactables[idx].position))[0]
+        return self.manager.closest_interactable(self.position, lambda i: i.can_highlight(self))
     
     def fire(self, firer: Pirate, cannon: interact.Cannon):
         super().fire(firer, cannon)
@@ -209,20 +223,26 @@ class Pirate(fireable.Fireable):
                     (lambda: firer.manager.ship_map.overlay.set_alpha(0), 0.2),
                 ])
 
+    def held_item(self) -> item.Item | None:
+        if self.held_item_idx == -1:
+            return None
+        return self.manager.items.get(self.held_item_idx)
+
     def pickup_item(self, item_idx: int):
         self.held_item_idx = item_idx
         self.manager.items[self.held_item_idx].held = True
         self.pickup_sound.play()
 
     def try_get_drunk(self):
-        if self.held_item_idx != -1:
-            if self.manager.items[self.held_item_idx].gets_you_drunk():
+        held = self.held_item()
+        if held is not None:
+            if held.gets_you_drunk():
                 def _drink():
                     self.drink_sound.play()
                     self.drunk_time += random.uniform(Pirate.MIN_DRUNK_TIME, Pirate.MAX_DRUNK_TIME)
                     self.can_move = True
 
-                self.manager.items[self.held_item_idx].removal_mark = True
+                held.removal_mark = True
                 self.can_move = False
                 event.sequence(
                     [
@@ -232,14 +252,15 @@ class Pirate(fireable.Fireable):
                 )
 
     def try_eat_lemon(self):
-        if self.held_item_idx != -1:
-            if self.manager.items[self.held_item_idx].cures_scurvy():
+        held = self.held_item()
+        if held is not None:
+            if held.cures_scurvy():
                 def _eat():
                     self.eat_sound.play()
                     self.scurvy_time = Pirate.SCURVY_TIME
                     self.can_move = True
 
-                self.manager.items[self.held_item_idx].removal_mark = True
+                held.removal_mark = True
                 self.can_move = False
                 event.sequence(
                     [
@@ -252,6 +273,7 @@ class Pirate(fireable.Fireable):
         pass
 
 class PlayerPirate(Pirate):
+    __slots__ = ('arrow', 'highlighted_idx')
 
     KEY_UP: int = pygame.K_w
     KEY_DOWN: int = pygame.K_s
@@ -269,6 +291,7 @@ class PlayerPirate(Pirate):
             {
                 '': (4, [(0, 4), (1, 4)])
             })
+        self.highlighted_idx = -1
 
     def get_movement(self, dt: float) -> pygame.Vector2:
         keys = pygame.key.get_pressed()
@@ -295,7 +318,7 @@ class PlayerPirate(Pirate):
         # colliders
         if consts.DRAW_COLLISION_BOXES:
             for collider in self.manager.fetch_all_colliders():
-                cam.with_zindex_provider(lambda s, r: pygame.draw.rect(s, 'green', cam.w2s_r(r), 8), self.manager.collider_rect(collider), 10)
+                cam.draw_rect('green', cam.w2s_r(self.manager.collider_rect(collider)), 8, 10)
     
     def update(self, dt: float, cam: camera.Camera):
         super().update(dt, cam)
@@ -305,11 +328,16 @@ class PlayerPirate(Pirate):
         pressed_interact = pygame.key.get_just_pressed()[PlayerPirate.KEY_INTERACT]
         use = pygame.key.get_just_pressed()[PlayerPirate.KEY_USE]
 
-        for idx in self.manager.interactables:
-            self.manager.interactables[idx].highlight = False
+        # only the player highlights, so clearing last frame's pick replaces resetting every interactable
+        previous = self.manager.interactables.get(self.highlighted_idx)
+        if previous is not None:
+            previous.highlight = False
+        self.highlighted_idx = -1
+
         closest = self.closest_interactable_idx()
         if closest != -1 and self.position.distance_squared_to(self.manager.interactables[closest].position) <= self.reach ** 2:
             self.manager.interactables[closest].highlight = True
+            self.highlighted_idx = closest
 
         if pressed_interact:
             picked_up_item = False
@@ -326,8 +354,10 @@ class PlayerPirate(Pirate):
                     cl = self.manager.interactables[closest]
                     cl.interact(self)
                 elif self.held_item_idx != -1:
-                    self.manager.items[self.held_item_idx].held = False
-                    self.manager.items[self.held_item_idx].position = self.position.copy()
+                    held = self.held_item()
+                    if held is not None:
+                        held.held = False
+                        held.position = self.position.copy()
                     self.held_item_idx = -1
 
         
@@ -345,17 +375,27 @@ class PlayerPirate(Pirate):
         )), 1.0)
 
 class NPCPirate(Pirate):
+    __slots__ = ('brain', 'brain_dt', 'target_position', 'target_idx', 'target_pos_tolerance', 'at_target')
+
     def __init__(self, manager: manager.GameManager, pos: pygame.Vector2) -> None:
         super().__init__(manager, pos)
 
         self.brain = PirateBrain()
+        self.brain_dt = 0.0
         self.target_position = self.position
+        # the interactable being walked to, -1 for a plain position
+        self.target_idx: int = -1
         self.target_pos_tolerance = 8
         self.at_target = False
 
     def update(self, dt: float, cam: camera.Camera):
         super().update(dt, cam)
-        self.brain.update(dt, cam, self)
+
+        # movement runs every frame, the brain only when the manager's ai budget reaches us
+        self.brain_dt += dt
+        if self.manager.ai.is_due(self):
+            self.brain.update(self.brain_dt, cam, self)
+            self.brain_dt = 0.0
         self.scurvy_time = Pirate.SCURVY_TIME # its easier to just let the mateys be immune to scurvy lol
         self.at_target = self.position.distance_squared_to(self.target_position) <= self.target_pos_tolerance ** 2
 
@@ -363,10 +403,57 @@ class NPCPirate(Pirate):
         super().get_movement(dt)
 
         if not self.at_target:
-            dist = (self.target_position - self.position)
+            dist = (self.steer_target() - self.position)
             if dist.length() != 0:
                 return dist.normalize()
         return pygame.Vector2(0,0)
+
+    def steer_target(self) -> pygame.Vector2:
+        # around obstacles on a flow field, straight at the target once there is nothing left to avoid
+        if self.target_idx != -1:
+            waypoint = self.manager.nav.waypoint(self.target_idx, self.position)
+        else:
+            waypoint = self.manager.nav.waypoint_to(self.target_position, self.position)
+        return self.target_position if waypoint is None else waypoint
+
+    @staticmethod
+    def steer_batch(npcs: list[NPCPirate], dt: float):
+        # the same steps as get_movement plus the drunk and speed handling in Pirate.update,
+        # for pirates that will reach the movement step this frame
+        n = len(npcs)
+        if n <= 0:
+            return
+
+        pos = np.array([(p.position.x, p.position.y) for p in npcs], dtype=np.float64)
+        target = np.array([tuple(p.target_position if p.at_target else p.steer_target()) for p in npcs], dtype=np.float64)
+        moving = np.array([not p.at_target for p in npcs], dtype=bool)
+        drunk = np.array([p.drunk_time for p in npcs], dtype=np.float64)
+        speed = np.array([p.speed for p in npcs], dtype=np.float64)
+        slowed = np.array([p.crouched or p.held_item_idx != -1 for p in npcs], dtype=bool)
+
+        delta = target - pos
+        length = np.sqrt(delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1])
+        steering = moving & (length != 0)
+        movement = np.zeros((n, 2), dtype=np.float64)
+        movement[steering] = delta[steering] / length[steering, None]
+
+        # wobble reads drunk_time before this frame's decrement, the speed boost after it
+        was_drunk = drunk > 0
+        length = np.sqrt(movement[:, 0] * movement[:, 0] + movement[:, 1] * movement[:, 1])
+        wobbling = was_drunk & (length != 0)
+        if wobbling.any():
+            # math.sin rather than np.sin so the result is bit-identical to the scalar path
+            sin = np.array([math.sin(d * 10) for d in drunk[wobbling]], dtype=np.float64)
+            direction = movement[wobbling][:, ::-1] / length[wobbling, None]
+            movement[wobbling] += direction * sin[:, None] * 0.3
+        drunk = np.where(was_drunk, np.minimum(drunk - dt, Pirate.MAX_DRUNK_TIME), drunk)
+
+        displacement = movement * dt * speed[:, None] * np.where(slowed, 0.6, 1.0)[:, None] * np.where(drunk > 0, 1.8, 1.0)[:, None]
+
+        for i, p in enumerate(npcs):
+            p.drunk_time = float(drunk[i])
+            p.pending_movement = pygame.Vector2(movement[i, 0], movement[i, 1])
+            p.pending_displacement = pygame.Vector2(displacement[i, 0], displacement[i, 1])
     
 
 
@@ -382,6 +469,8 @@ class PirateBrain(brain.Brain[NPCPirate]):
         self.add_task(EatLemonTask, 10)
         self.add_task(RepairBoatTask, 8)
 
+        self.fallback = WalkToPositionTask
+
 class WalkToPositionTask(brain.Task[NPCPirate]):
     def __init__(self) -> None:
         super().__init__()
@@ -399,6 +488,7 @@ class WalkToPositionTask(brain.Task[NPCPirate]):
     def process(self, dt: float, cam: camera.Camera, t: NPCPirate):
         super().process(dt, cam, t)
         t.target_position = self.target.copy()
+        t.target_idx = -1
 
 class FindItemTask(brain.Task[NPCPirate]):
     def __init__(self) -> None:
@@ -408,7 +498,7 @@ class FindItemTask(brain.Task[NPCPirate]):
         
     
     def start(self, t: NPCPirate):
-        l = list(filter(lambda idx: isinstance(t.manager.interactables[idx], interact.ItemBarrel), t.manager.interactables.keys()))
+        l = t.manager.interactables_of(interact.ItemBarrel)
         if len(l) <= 0:
             return
         self.target = l[random.randint(0, len(l) - 1)]
@@ -417,6 +507,7 @@ class FindItemTask(brain.Task[NPCPirate]):
     def process(self, dt: float, cam: camera.Camera, t: NPCPirate):
         super().process(dt, cam, t)
         t.target_position = t.manager.interactables[self.target].position.copy()
+        t.target_idx = self.target
 
         if t.position.distance_squared_to(t.manager.interactables[self.target].position) <= (t.reach * 2) ** 2 and t.held_item_idx == -1:
             cl = t.manager.interactables[self.target]
@@ -425,6 +516,7 @@ class FindItemTask(brain.Task[NPCPirate]):
                     cl.interact(t)
                     self.done = True
                     t.target_position = t.position.copy()
+                    t.target_idx = -1
 
     
     def can_finish(self, t: NPCPirate) -> bool:
@@ -440,24 +532,28 @@ class PickUpItemTask(brain.Task[NPCPirate]):
         
 
     def start(self, t: NPCPirate):
-        l = list(filter(lambda idx: t.manager.items[idx].can_be_picked_up(), t.manager.items.keys()))
+        l = [idx for idx, i in t.manager.items.items() if i.can_be_picked_up()]
         if len(l) <= 0:
             return
         self.target = l[random.randint(0, len(l) - 1)]
 
     def process(self, dt: float, cam: camera.Camera, t: NPCPirate):
         super().process(dt, cam, t)
-        if self.target != -1:
-            t.target_position = t.manager.items[self.target].position.copy()
+        target = t.manager.items.get(self.target)
+        if target is not None:
+            t.target_position = target.position.copy()
+            t.target_idx = -1
 
-            if t.position.distance_squared_to(t.manager.items[self.target].position) <= t.reach ** 2 and t.manager.items[self.target].can_be_picked_up(): 
+            if t.position.distance_squared_to(target.position) <= t.reach ** 2 and target.can_be_picked_up(): 
                 t.pickup_item(self.target)
     
     def prereq(self, t: NPCPirate) -> bool:
         return len(t.manager.items) > 0 and t.held_item_idx == -1
 
     def can_finish(self, t: NPCPirate) -> bool:
-        return self.target == -1 or not t.manager.items[self.target].can_be_picked_up() and t.manager.items[self.target].ai_picks_up()
+        # a target removed since start() reads as stale rather than raising
+        target = t.manager.items.get(self.target)
+        return target is None or not target.can_be_picked_up() and target.ai_picks_up()
 
 class FireCannonTask(brain.Task[NPCPirate]):
     def __init__(self) -> None:
@@ -467,7 +563,7 @@ class FireCannonTask(brain.Task[NPCPirate]):
         
     
     def start(self, t: NPCPirate):
-        l = list(filter(lambda idx: isinstance(t.manager.interactables[idx], interact.Cannon), t.manager.interactables.keys()))
+        l = t.manager.interactables_of(interact.Cannon)
         if len(l) <= 0:
             return
         self.target = l[random.randint(0, len(l) - 1)]
@@ -475,12 +571,13 @@ class FireCannonTask(brain.Task[NPCPirate]):
     def process(self, dt: float, cam: camera.Camera, t: NPCPirate):
         super().process(dt, cam, t)
         t.target_position = t.manager.interactables[self.target].position.copy()
+        t.target_idx = self.target
 
         if t.position.distance_squared_to(t.manager.interactables[self.target].position) <= t.reach ** 2 and t.held_item_idx != -1:
             cl = t.manager.interactables[self.target]
             if isinstance(cl, interact.Cannon):
                 if cl.cooldown <= 0:
-                    t.manager.fire_cannon(t, t.manager.items[t.held_item_idx], cl)
+                    t.manager.fire_cannon(t, t.held_item(), cl)
                     t.held_item_idx = -1
     
     def can_finish(self, t: NPCPirate) -> bool:
@@ -489,7 +586,8 @@ class FireCannonTask(brain.Task[NPCPirate]):
         return t.held_item_idx == -1 or c.cooldown > 0
 
     def prereq(self, t: NPCPirate) -> bool:
-        return t.held_item_idx != -1 and len(t.manager.interactables) > 0 and t.manager.items[t.held_item_idx].ai_launches()
+        held = t.held_item()
+        return held is not None and len(t.manager.interactables) > 0 and held.ai_launches()
     
 class GetPissedTask(brain.Task[NPCPirate]):
 
@@ -498,7 +596,8 @@ class GetPissedTask(brain.Task[NPCPirate]):
         t.try_get_drunk()
 
     def prereq(self, t: NPCPirate) -> bool:
-        return t.held_item_idx != -1 and t.manager.items[t.held_item_idx].gets_you_drunk()
+        held = t.held_item()
+        return held is not None and held.gets_you_drunk()
     
     def can_finish(self, t: NPCPirate) -> bool:
         return t.held_item_idx == -1
@@ -510,7 +609,8 @@ class EatLemonTask(brain.Task[NPCPirate]):
         t.try_eat_lemon()
 
     def prereq(self, t: NPCPirate) -> bool:
-        return t.held_item_idx != -1 and t.manager.items[t.held_item_idx].cures_scurvy()
+        held = t.held_item()
+        return held is not None and held.cures_scurvy()
     
     def can_finish(self, t: NPCPirate) -> bool:
         return t.held_item_idx == -1
@@ -523,7 +623,7 @@ class RepairBoatTask(brain.Task[NPCPirate]):
         
     
     def start(self, t: NPCPirate):
-        l = list(filter(lambda idx: isinstance(t.manager.interactables[idx], interact.DamageSpot), t.manager.interactables.keys()))
+        l = t.manager.interactables_of(interact.DamageSpot)
         if len(l) <= 0:
             return
         self.target = l[random.randint(0, len(l) - 1)]
@@ -531,6 +631,7 @@ class RepairBoatTask(brain.Task[NPCPirate]):
     def process(self, dt: float, cam: camera.Camera, t: NPCPirate):
         super().process(dt, cam, t)
         t.target_position = t.manager.interactables[self.target].position.copy()
+        t.target_idx = self.target
 
         if t.position.distance_squared_to(t.manager.interactables[self.target].position) <= t.reach ** 2 and t.held_item_idx != -1:
             cl = t.manager.interactables[self.target]
@@ -541,5 +642,6 @@ class RepairBoatTask(brain.Task[NPCPirate]):
         return t.held_item_idx == -1 or not self.target in t.manager.interactables
 
     def prereq(self, t: NPCPirate) -> bool:
-        return t.held_item_idx != -1 and len(list(filter(lambda idx: isinstance(t.manager.interactables[idx], interact.DamageSpot), t.manager.interactables.keys()))) > 0 and t.manager.items[t.held_item_idx].fixes_damage()
+        held = t.held_item()
+        return held is not None and t.manager.count_interactables_of(interact.DamageSpot) > 0 and held.fixes_damage()
  
\ No newline at end of file
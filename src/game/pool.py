@@ -0,0 +1,118 @@
+import typing
+
+class Pool[T]():
+    # a handle packs the slot into the low bits and the slot's generation above it,
+    # so a handle to a freed slot never matches whatever reuses that slot
+    INDEX_BITS: int = 20
+    INDEX_MASK: int = (1 << INDEX_BITS) - 1
+
+    def __init__(self) -> None:
+        # dead slots keep their instance around so spawn can reuse it
+        self.slots: list[T | None] = []
+        self.generations: list[int] = []
+        self.alive: list[bool] = []
+        self.free: list[int] = []
+        self.live = 0
+
+        self.created = 0
+        self.reused = 0
+        self.stale_lookups = 0
+
+    def __len__(self) -> int:
+        return self.live
+
+    def __contains__(self, handle: int) -> bool:
+        return self._slot(handle) != -1
+
+    def __getitem__(self, handle: int) -> T:
+        obj = self.get(handle)
+        if obj is None:
+            raise KeyError(handle)
+        return obj
+
+    def __iter__(self) -> typing.Iterator[int]:
+        # indexed so slots spawned or removed mid-iteration are tolerated
+        for slot in range(len(self.slots)):
+            if self.alive[slot]:
+                yield (self.generations[slot] << Pool.INDEX_BITS) | slot
+
+    def items(self) -> typing.Iterator[tuple[int, T]]:
+        for handle in self:
+            yield handle, typing.cast(T, self.slots[handle & Pool.INDEX_MASK])
+
+    def values(self) -> typing.Iterator[T]:
+        for _, obj in self.items():
+            yield obj
+
+    def _slot(self, handle: int) -> int:
+        if handle < 0:
+            return -1
+        slot = handle & Pool.INDEX_MASK
+        if slot >= len(self.slots) or not self.alive[slot] or self.generations[slot] != handle >> Pool.INDEX_BITS:
+            return -1
+        return slot
+
+    def _claim(self) -> int:
+        if self.free:
+            return self.free.pop()
+
+        slot = len(self.slots)
+        if slot > Pool.INDEX_MASK:
+            raise OverflowError("pool is out of slots")
+        self.slots.append(None)
+        self.generations.append(0)
+        self.alive.append(False)
+        return slot
+
+    def _activate(self, slot: int, obj: T) -> int:
+        self.slots[slot] = obj
+        self.alive[slot] = True
+        self.live += 1
+        return (self.generations[slot] << Pool.INDEX_BITS) | slot
+
+    def add(self, obj: T) -> int:
+        self.created += 1
+        return self._activate(self._claim(), obj)
+
+    def spawn(self, create: typing.Callable[[], T], reset: typing.Callable[[T], typing.Any]) -> int:
+        slot = self._claim()
+        obj = self.slots[slot]
+        if obj is None:
+            obj = create()
+            self.created += 1
+        else:
+            reset(obj)
+            self.reused += 1
+        return self._activate(slot, obj)
+
+    def get(self, handle: int) -> T | None:
+        slot = self._slot(handle)
+        if slot == -1:
+            if handle >= 0:
+                self.stale_lookups += 1
+            return None
+        return self.slots[slot]
+
+    def remove(self, handle: int) -> bool:
+        slot = self._slot(handle)
+        if slot == -1:
+            return False
+
+        self.alive[slot] = False
+        self.generations[slot] += 1
+        self.free.append(slot)
+        self.live -= 1
+        return True
+
+    def clear(self):
+        for handle in list(self):
+            self.remove(handle)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'live': self.live,
+            'slots': len(self.slots),
+            'created': self.created,
+            'reused': self.reused,
+            'stale_lookups': self.stale_lookups,
+        }
@@ -0,0 +1,117 @@
+import pygame
+import numpy as np
+import random
+
+from src import util
+from src import consts
+from src.render import camera
+from src.render import spritesheet
+from src.render import animate
+from src.game import fireable
+from src.game import item
+
+class Landings():
+    def __init__(self, item_id: np.ndarray, position: np.ndarray, fired_up: np.ndarray, damage: np.ndarray) -> None:
+        self.item_id = item_id
+        self.position = position
+        self.fired_up = fired_up
+        self.damage = damage
+
+    def __len__(self) -> int:
+        return len(self.item_id)
+
+class ProjectileSystem():
+    def __init__(self, capacity: int = consts.PROJECTILE_CAPACITY) -> None:
+        self.count = 0
+        self.position = np.zeros((capacity, 2), dtype=np.float64)
+        self.velocity = np.zeros((capacity, 2), dtype=np.float64)
+        self.rotation = np.zeros(capacity, dtype=np.float64)
+        self.random_variance = np.zeros(capacity, dtype=np.float64)
+        self.item_id = np.zeros(capacity, dtype=np.int16)
+        self.fired_up = np.zeros(capacity, dtype=bool)
+
+        self.damage_mult = np.array([entry[2] for entry in item.Item.ITEMS], dtype=np.float64)
+        self.causes_damage = np.array([entry[3] for entry in item.Item.ITEMS], dtype=bool)
+
+        # seeded from the stdlib rng so a seeded run stays reproducible
+        self.rng = np.random.default_rng(random.getrandbits(32))
+
+        sheet = spritesheet.Spritesheet(util.load_texture('res/items.png'))
+        table = animate.FrameTable.compile(sheet, item.Item.FRAMES)
+        self.frames = [table.frames[entry[1]][0][0] for entry in item.Item.ITEMS]
+
+    def capacity(self) -> int:
+        return len(self.item_id)
+
+    def grow(self, capacity: int):
+        for name in ('position', 'velocity', 'rotation', 'random_variance', 'item_id', 'fired_up'):
+            old: np.ndarray = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def spawn(self, item_id: int, pos: pygame.Vector2, fired_up: bool, random_variance: float | None = None, rotation: float = 0.0):
+        if self.count >= self.capacity():
+            self.grow(max(1, self.capacity() * 2))
+
+        i = self.count
+        self.position[i] = (pos.x, pos.y)
+        self.velocity[i] = (0.0, -fireable.Fireable.FIRE_SPEED if fired_up else fireable.Fireable.FIRE_SPEED)
+        self.rotation[i] = rotation
+        self.random_variance[i] = random.random() if random_variance is None else random_variance
+        self.item_id[i] = item_id
+        self.fired_up[i] = fired_up
+        self.count += 1
+
+    def update(self, dt: float) -> Landings:
+        n = self.count
+        pos = self.position[:n]
+        up = self.fired_up[:n]
+
+        pos += self.velocity[:n] * dt
+        self.rotation[:n] += fireable.Fireable.FIRE_ROT_SPEED * dt
+
+        landed = np.where(up, pos[:, 1] < -600, pos[:, 1] > 250 + (self.random_variance[:n] - 0.5) * 180)
+        if not landed.any():
+            return Landings(self.item_id[:0], pos[:0], up[:0], np.zeros(0))
+
+        ids = self.item_id[:n][landed]
+        landings = Landings(
+            ids.copy(),
+            pos[landed].copy(),
+            up[landed].copy(),
+            self.rng.uniform(1, 5, len(ids)) * self.damage_mult[ids],
+        )
+        self.compact(~landed)
+        return landings
+
+    def compact(self, keep: np.ndarray):
+        n = int(keep.sum())
+        for arr in (self.position, self.velocity, self.rotation, self.random_variance, self.item_id, self.fired_up):
+            arr[:n] = arr[:self.count][keep]
+        self.count = n
+
+    def clear(self):
+        self.count = 0
+
+    def draw(self, cam: camera.Camera):
+        n = self.count
+        if n <= 0:
+            return
+
+        # conservative bounds that hold at any rotation, per-sprite culling is then skipped
+        vp = cam.cull_vp()
+        half = max(f.get_width() for f in self.frames) * consts.DRAW_SCALE * 0.75
+        pos = self.position[:n]
+        visible = (pos[:, 0] - half < vp.right) & (pos[:, 0] + half > vp.left) & (pos[:, 1] - half < vp.bottom) & (pos[:, 1] + half > vp.top)
+        cam.cull_stats.culled += n - int(visible.sum())
+
+        for i in np.flatnonzero(visible):
+            cam.blit(
+                self.frames[self.item_id[i]],
+                pygame.Vector2(float(pos[i, 0]), float(pos[i, 1])),
+                rotation=float(self.rotation[i]),
+                scale=consts.DRAW_SCALE,
+                skip_cull=True,
+                zindex=1 if self.fired_up[i] else -1
+            )
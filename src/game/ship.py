@@ -48,9 +48,11 @@ class Ship():
         self.overlay.fill(0x0)
 
         self.map_colliders = map.MapRenderer.compile_colliders(self.map_data, consts.DRAW_SCALE, pygame.Vector2())
+        self.map_bounds = map.MapRenderer.map_bounds(self.map_data, consts.DRAW_SCALE, pygame.Vector2())
+        self.map_layer = map.MapRenderer.bake_map(self.map_data, consts.DRAW_SCALE)
 
     def draw(self, cam: camera.Camera):
-        map.MapRenderer.draw_map(cam, pygame.Vector2(), self.map_data, consts.DRAW_SCALE)
+        map.MapRenderer.draw_baked(cam, pygame.Vector2(), self.map_layer)
 
         v = self.overlay.get_alpha()
         if v is not None and v > 0:
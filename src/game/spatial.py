@@ -0,0 +1,206 @@
+import pygame
+import typing
+
+from src import consts
+
+type _Cell = tuple[int, int]
+
+class SpatialHash[K]():
+    def __init__(self, cell_size: int = consts.SPATIAL_CELL_SIZE) -> None:
+        self.cell_size = cell_size
+
+        self.cells: dict[_Cell, dict[K, None]] = {}
+        self.rects: dict[K, pygame.Rect] = {}
+
+        # insertion order, so queries come back in the same order a full scan would visit them
+        self._order: dict[K, int] = {}
+        self._next_order = 0
+
+    def __len__(self) -> int:
+        return len(self.rects)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self.rects
+
+    def cells_for(self, rect: pygame.Rect) -> typing.Iterator[_Cell]:
+        cs = self.cell_size
+        for cy in range(rect.top // cs, (rect.bottom - 1) // cs + 1):
+            for cx in range(rect.left // cs, (rect.right - 1) // cs + 1):
+                yield (cx, cy)
+
+    def insert(self, key: K, rect: pygame.Rect):
+        if key in self.rects:
+            self.update(key, rect)
+            return
+
+        self._order[key] = self._next_order
+        self._next_order += 1
+        self._place(key, rect)
+
+    def update(self, key: K, rect: pygame.Rect):
+        old = self.rects.get(key)
+        if old is None:
+            self.insert(key, rect)
+            return
+        if old == rect:
+            return
+
+        self._unplace(key, old)
+        self._place(key, rect)
+
+    def remove(self, key: K):
+        old = self.rects.get(key)
+        if old is None:
+            return
+
+        self._unplace(key, old)
+        del self._order[key]
+
+    def query(self, rect: pygame.Rect) -> list[K]:
+        found: dict[K, None] = {}
+        for cell in self.cells_for(rect):
+            bucket = self.cells.get(cell)
+            if bucket is not None:
+                found.update(bucket)
+
+        if len(found) <= 1:
+            return list(found)
+        return sorted(found, key=self._order.__getitem__)
+
+    def _place(self, key: K, rect: pygame.Rect):
+        rect = pygame.Rect(rect)
+        self.rects[key] = rect
+
+        # empty rects can never overlap anything, so they are tracked but not bucketed
+        if rect.w <= 0 or rect.h <= 0:
+            return
+        for cell in self.cells_for(rect):
+            self.cells.setdefault(cell, {})[key] = None
+
+    def _unplace(self, key: K, rect: pygame.Rect):
+        del self.rects[key]
+        if rect.w <= 0 or rect.h <= 0:
+            return
+        for cell in self.cells_for(rect):
+            bucket = self.cells.get(cell)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del self.cells[cell]
+
+class PointHash[K]():
+    def __init__(self, cell_size: int = consts.SPATIAL_CELL_SIZE) -> None:
+        self.cell_size = cell_size
+
+        self.cells: dict[_Cell, dict[K, None]] = {}
+        self.points: dict[K, tuple[float, float]] = {}
+        self._order: dict[K, int] = {}
+        self._next_order = 0
+
+        # occupied cell bounds, so nearest knows when it has run out of rings
+        self._bounds: tuple[int, int, int, int] | None = None
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self.points
+
+    def cell_of(self, x: float, y: float) -> _Cell:
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def insert(self, key: K, pos: pygame.typing.Point):
+        if key in self.points:
+            self.move(key, pos)
+            return
+
+        self._order[key] = self._next_order
+        self._next_order += 1
+        self._place(key, (pos[0], pos[1]))
+
+    def move(self, key: K, pos: pygame.typing.Point):
+        old = self.points.get(key)
+        if old is None:
+            self.insert(key, pos)
+            return
+        if old[0] == pos[0] and old[1] == pos[1]:
+            return
+
+        self._unplace(key, old)
+        self._place(key, (pos[0], pos[1]))
+
+    def remove(self, key: K):
+        old = self.points.get(key)
+        if old is None:
+            return
+
+        self._unplace(key, old)
+        del self._order[key]
+
+    def nearest(self, pos: pygame.typing.Point, accept: typing.Callable[[K], bool] | None = None) -> K | None:
+        if not self.points:
+            return None
+
+        x, y = pos[0], pos[1]
+        cx, cy = self.cell_of(x, y)
+        min_x, min_y, max_x, max_y = self._get_bounds()
+        max_ring = max(abs(cx - min_x), abs(cx - max_x), abs(cy - min_y), abs(cy - max_y))
+
+        best: K | None = None
+        best_d2 = 0.0
+        best_order = 0
+        for ring in range(max_ring + 1):
+            for cell in self._ring(cx, cy, ring):
+                bucket = self.cells.get(cell)
+                if bucket is None:
+                    continue
+                for key in bucket:
+                    px, py = self.points[key]
+                    d2 = (px - x) ** 2 + (py - y) ** 2
+                    # ties go to the earliest inserted key, same as a stable sort over a full scan
+                    if best is not None and (d2 > best_d2 or (d2 == best_d2 and self._order[key] > best_order)):
+                        continue
+                    if accept is not None and not accept(key):
+                        continue
+                    best, best_d2, best_order = key, d2, self._order[key]
+
+            # anything in a further ring is at least ring * cell_size away
+            if best is not None and best_d2 < (ring * self.cell_size) ** 2:
+                break
+        return best
+
+    def _ring(self, cx: int, cy: int, ring: int) -> typing.Iterator[_Cell]:
+        if ring == 0:
+            yield (cx, cy)
+            return
+        for x in range(cx - ring, cx + ring + 1):
+            yield (x, cy - ring)
+            yield (x, cy + ring)
+        for y in range(cy - ring + 1, cy + ring):
+            yield (cx - ring, y)
+            yield (cx + ring, y)
+
+    def _get_bounds(self) -> tuple[int, int, int, int]:
+        if self._bounds is None:
+            xs = [cell[0] for cell in self.cells]
+            ys = [cell[1] for cell in self.cells]
+            self._bounds = (min(xs), min(ys), max(xs), max(ys))
+        return self._bounds
+
+    def _place(self, key: K, pos: tuple[float, float]):
+        self.points[key] = pos
+        cell = self.cell_of(*pos)
+        if cell not in self.cells:
+            self.cells[cell] = {}
+            self._bounds = None
+        self.cells[cell][key] = None
+
+    def _unplace(self, key: K, pos: tuple[float, float]):
+        del self.points[key]
+        cell = self.cell_of(*pos)
+        bucket = self.cells.get(cell)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del self.cells[cell]
+                self._bounds = None
@@ -0,0 +1,98 @@
+import pygame
+import os
+import random
+import time
+
+from src import window
+from src import trace
+from src.render import scene
+from src.game import game
+from src.game import brain
+from src.menu import mainmenu
+from src.menu import credits
+
+SCENES: dict[str, type[scene.Scene]] = {
+    'menu': mainmenu.MainMenu,
+    'credits': credits.CreditsScene,
+    'game': game.GameScene,
+}
+
+class HeadlessReport():
+    def __init__(self, frames: int, dt: float, wall_seconds: float, scene_changes: int, final_scene: str, decisions: int = 0) -> None:
+        self.frames = frames
+        self.dt = dt
+        self.sim_seconds = frames * dt
+        self.wall_seconds = wall_seconds
+        self.scene_changes = scene_changes
+        self.final_scene = final_scene
+        self.decisions = decisions
+
+    def sim_per_wall(self) -> float:
+        return self.sim_seconds / self.wall_seconds if self.wall_seconds > 0 else float('inf')
+
+    def frames_per_second(self) -> float:
+        return self.frames / self.wall_seconds if self.wall_seconds > 0 else float('inf')
+
+    def decisions_per_second(self) -> float:
+        return self.decisions / self.sim_seconds if self.sim_seconds > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.frames} frames ({self.sim_seconds:.1f}s simulated) in {self.wall_seconds:.2f}s wall | "
+            f"{self.sim_per_wall():.2f} sim-s/wall-s | {self.frames_per_second():.0f} frames/s | "
+            f"{self.decisions_per_second():.1f} ai decisions/sim-s | "
+            f"scene changes: {self.scene_changes}, final scene: {self.final_scene}"
+        )
+
+class HeadlessRunner():
+    def __init__(self, default_scene: type[scene.Scene], dt: float = 1 / 60, seed: int = 0, draw: bool = True) -> None:
+        self.dt = dt
+        self.seed = seed
+        self.draw = draw
+
+        HeadlessRunner.init_pygame()
+        random.seed(seed)
+
+        self.window = window.Window(default_scene, headless=True)
+        self.window.init_resources()
+
+    def scene(self) -> scene.Scene:
+        return self.window.scene_manager.current
+
+    def step(self) -> str | None:
+        with trace.span('frame'):
+            self.window.profiler.begin_frame()
+            self.window.stats.begin_frame()
+            self.window.event(self.dt)
+            self.window.update(self.dt)
+            if self.draw:
+                self.window.draw(self.window.canvas)
+            self.window.stats.end_frame()
+            return self.window.profiler.end_frame(self.scene())
+
+    def run(self, frames: int) -> HeadlessReport:
+        scene_changes = 0
+        current = self.scene()
+        decisions = brain.Brain.decisions
+
+        start = time.perf_counter()
+        for _ in range(frames):
+            self.step()
+            if self.scene() is not current:
+                scene_changes += 1
+                current = self.scene()
+        wall = time.perf_counter() - start
+
+        return HeadlessReport(frames, self.dt, wall, scene_changes, type(current).__name__, brain.Brain.decisions - decisions)
+
+    @staticmethod
+    def configure_drivers():
+        # must happen before pygame.init, SDL picks its drivers once
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+    @staticmethod
+    def init_pygame():
+        HeadlessRunner.configure_drivers()
+        if not pygame.get_init():
+            pygame.init()
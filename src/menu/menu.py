@@ -17,4 +17,7 @@ class MenuScene(scene.Scene):
     
     def update(self, dt: float, camera: camera.Camera):
         super().update(dt, camera)
-        self.container.update(dt, camera)
\ No newline at end of file
+        self.container.update(dt, camera)
+
+    def entity_counts(self) -> dict[str, int]:
+        return {'ui elements': len(self.container.elements)}
\ No newline at end of file
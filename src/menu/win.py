@@ -2,6 +2,7 @@ import pygame
 
 from src import util
 from src import event
+from src import sound
 from src import consts
 from src.render import camera
 from src.render import animate
@@ -19,7 +20,7 @@ class WinScene(menu.MenuScene):
         super().__init__(camera, ctx)
         camera.fill_col = 0x2890dc
 
-        self.win = pygame.mixer.Sound('res/sound/win.ogg')
+        self.win = sound.get('res/sound/win.ogg')
         self.win.play()
 
         self.container.add(
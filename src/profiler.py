@@ -0,0 +1,63 @@
+import cProfile
+import io
+import os
+import pstats
+import time
+
+from src import consts
+from src.render import scene
+
+class FrameProfiler():
+    def __init__(self) -> None:
+        self.remaining = 0
+        self.frames = 0
+        self.profile: cProfile.Profile | None = None
+        self.last_path: str | None = None
+
+    def active(self) -> bool:
+        return self.profile is not None
+
+    def request(self, frames: int = consts.PROFILE_FRAMES):
+        if self.profile is not None or frames <= 0:
+            return
+        self.remaining = frames
+        self.frames = frames
+
+    def begin_frame(self):
+        if self.remaining > 0 and self.profile is None:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+
+    def end_frame(self, current: scene.Scene) -> str | None:
+        if self.profile is None:
+            return None
+
+        self.remaining -= 1
+        if self.remaining > 0:
+            return None
+
+        self.profile.disable()
+        path = self.save(self.profile, current)
+        self.profile = None
+        return path
+
+    def save(self, profile: cProfile.Profile, current: scene.Scene) -> str:
+        os.makedirs(consts.PROFILE_DIR, exist_ok=True)
+        scene_name = type(current).__name__
+        base = os.path.join(consts.PROFILE_DIR, f"profile-{time.strftime('%Y%m%d-%H%M%S')}-{scene_name}")
+
+        profile.dump_stats(base + '.pstats')
+
+        summary = io.StringIO()
+        summary.write(f"scene: {scene_name}\n")
+        summary.write(f"frames: {self.frames}\n")
+        for name, count in current.entity_counts().items():
+            summary.write(f"{name}: {count}\n")
+        summary.write("\n")
+        pstats.Stats(profile, stream=summary).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(20)
+
+        with open(base + '.txt', 'w') as f:
+            f.write(summary.getvalue())
+
+        self.last_path = base + '.pstats'
+        return self.last_path
@@ -1,12 +1,52 @@
 import pygame
 import typing
+import weakref
 
 from src.render import spritesheet
 
+type _Anims = dict[str, tuple[int, list[tuple[int, int]]]]
+type _Frames = tuple[pygame.Surface, ...]
+
+class FrameTable():
+    # sheet texture -> (layout + animation key -> table), dropped together with the texture
+    TABLES: weakref.WeakKeyDictionary[pygame.Surface, dict[tuple, FrameTable]] = weakref.WeakKeyDictionary()
+
+    def __init__(self, sprsht: spritesheet.Spritesheet, anims: _Anims, scale: float = 1) -> None:
+        self.scale = scale
+        self.frames: dict[str, tuple[_Frames, _Frames]] = {}
+
+        for key, (_, cells) in anims.items():
+            normal = tuple(sprsht.get_cell(*cell) for cell in cells)
+            if scale != 1:
+                normal = tuple(pygame.transform.scale_by(frame, scale) for frame in normal)
+            mirrored = tuple(pygame.transform.flip(frame, True, False) for frame in normal)
+            self.frames[key] = (normal, mirrored)
+
+    @staticmethod
+    def compile(sprsht: spritesheet.Spritesheet, anims: _Anims, scale: float = 1) -> FrameTable:
+        key = (
+            sprsht.cell_w, sprsht.cell_h, sprsht.padding_x, sprsht.padding_y, scale,
+            tuple((name, tuple(cells)) for name, (_, cells) in anims.items())
+        )
+
+        tables = FrameTable.TABLES.get(sprsht.spritesheet_texture)
+        if tables is None:
+            tables = {}
+            FrameTable.TABLES[sprsht.spritesheet_texture] = tables
+
+        table = tables.get(key)
+        if table is None:
+            table = FrameTable(sprsht, anims, scale)
+            tables[key] = table
+        return table
+
 class AnimatedTexture():
-    def __init__(self, sprsht: spritesheet.Spritesheet, anims: dict[str, tuple[int, list[tuple[int, int]]]]) -> None:
+    __slots__ = ('sprsht', 'anims', 'table', 'last_anim', 'selected_anim', 'frame', 'timer', 'oneshot', 'loop', 'can_change', 'flipped')
+
+    def __init__(self, sprsht: spritesheet.Spritesheet, anims: dict[str, tuple[int, list[tuple[int, int]]]], scale: float = 1) -> None:
         self.sprsht = sprsht
         self.anims = anims
+        self.table = FrameTable.compile(sprsht, anims, scale)
 
         self.last_anim = ''
         self.selected_anim = ''
@@ -39,8 +79,9 @@ class AnimatedTexture():
                     self.oneshot = False
 
     def get_frame(self) -> pygame.Surface:
-        return pygame.transform.flip(self.sprsht.get_cell(*self.anims[self.selected_anim][1][min(self.frame,len(self.anims[self.selected_anim][1]) - 1)]), self.flipped, False)
-    
+        frames = self.table.frames[self.selected_anim][1 if self.flipped else 0]
+        return frames[min(self.frame, len(frames) - 1)]
+
     def set_anim(self, key: str, oneshot: bool = False, loop: bool = True):
         if key != self.selected_anim and self.can_change:
             self.last_anim = self.selected_anim
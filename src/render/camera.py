@@ -2,23 +2,123 @@ from __future__ import annotations
 import pygame
 import typing
 import random
+import math
+import bisect
 
 from src import consts
+from src import trace
+from src.render import transform
+
+if typing.TYPE_CHECKING:
+    from src.render import text
 
 type _SurfaceOp = typing.Callable[[pygame.Surface], typing.Any]
 type _BlitParams = tuple[pygame.Surface, pygame.Vector2]
-type _Op = _SurfaceOp | _BlitParams
+type _Command = (
+    tuple[typing.Literal[0], pygame.typing.ColorLike, pygame.Rect, int] # rect
+    | tuple[typing.Literal[1], text.PixelFont, str, float, pygame.typing.ColorLike | None, pygame.Vector2, bool] # text
+    | tuple[typing.Literal[2], _SurfaceOp] # op
+)
+
+CMD_RECT: int = 0
+CMD_TEXT: int = 1
+CMD_OP: int = 2
+
+class CullStats():
+    def __init__(self) -> None:
+        self.culled = 0
+        self.drawn = 0
+
+        self.last_culled = 0
+        self.last_drawn = 0
+
+    def end_frame(self):
+        self.last_culled = self.culled
+        self.last_drawn = self.drawn
+        self.culled = 0
+        self.drawn = 0
+
+class DrawBuffer():
+    # per layer, blits are flushed first as one batch, then the other commands in submission order
+    def __init__(self, zmin: int = consts.ZINDEX_MIN, zmax: int = consts.ZINDEX_MAX) -> None:
+        self.zmin = zmin
+        self.zmax = zmax
+
+        layers = zmax - zmin + 1
+        self.blits: list[list[_BlitParams]] = [[] for _ in range(layers)]
+        self.commands: list[list[_Command]] = [[] for _ in range(layers)]
+
+        # sorted slots that received anything this frame
+        self.active: list[int] = []
+        self._used = bytearray(layers)
+
+        self.submitted = 0
+        self.last_submitted = 0
+
+    def _slot(self, zindex: int) -> int:
+        slot = min(max(zindex, self.zmin), self.zmax) - self.zmin
+        if not self._used[slot]:
+            self._used[slot] = 1
+            bisect.insort(self.active, slot)
+        return slot
+
+    def blit(self, surface: pygame.Surface, pos: pygame.Vector2, zindex: int = 0):
+        self.blits[self._slot(zindex)].append((surface, pos))
+        self.submitted += 1
+
+    def rect(self, color: pygame.typing.ColorLike, rect: pygame.Rect, width: int = 0, zindex: int = 0):
+        self.commands[self._slot(zindex)].append((CMD_RECT, color, rect, width))
+        self.submitted += 1
+
+    def text(self, font: text.PixelFont, string: str, scale: float, color: pygame.typing.ColorLike | None, pos: pygame.Vector2, centered: bool = False, zindex: int = 0):
+        self.commands[self._slot(zindex)].append((CMD_TEXT, font, string, scale, color, pos, centered))
+        self.submitted += 1
+
+    def op(self, op: _SurfaceOp, zindex: int = 0):
+        self.commands[self._slot(zindex)].append((CMD_OP, op))
+        self.submitted += 1
+
+    def render(self, canvas: pygame.Surface):
+        for slot in self.active:
+            blits = self.blits[slot]
+            if blits:
+                canvas.fblits(blits)
+                blits.clear()
+
+            commands = self.commands[slot]
+            for cmd in commands:
+                kind = cmd[0]
+                if kind == CMD_RECT:
+                    pygame.draw.rect(canvas, cmd[1], cmd[2], cmd[3])
+                elif kind == CMD_TEXT:
+                    surface = cmd[1].render_adv(cmd[2], cmd[3], cmd[4])
+                    canvas.blit(surface, (cmd[5] - pygame.Vector2(surface.size) / 2) if cmd[6] else cmd[5])
+                else:
+                    cmd[1](canvas)
+            commands.clear()
+
+            self._used[slot] = 0
+        self.active.clear()
+
+        self.last_submitted = self.submitted
+        self.submitted = 0
 
 class Camera():
 
-    def __init__(self, window: pygame.Window) -> None:
+    def __init__(self, window: pygame.Window, transform_cache: transform.TransformCache | None = None, cull_stats: CullStats | None = None, buffer: DrawBuffer | None = None) -> None:
         self.focus = pygame.Vector2(0, 0)
         self.zoom = 1.0
         self.fill_col = 0x0
 
         self.window = window
+        self.transform_cache = transform_cache if transform_cache is not None else transform.TransformCache()
+        self.cull_stats = cull_stats if cull_stats is not None else CullStats()
+        self._cull_vp: tuple[float, float, float, pygame.Rect] | None = None
 
-        self._frame_blits: dict[int, tuple[list[_SurfaceOp], list[_BlitParams]]] = {}
+        # area of the window the canvas is presented into, None means the whole window
+        self.present_rect: pygame.Rect | None = None
+
+        self.buffer = buffer if buffer is not None else DrawBuffer()
 
     def w2s(self, world: pygame.Vector2) -> pygame.Vector2:
         pivot = (pygame.Vector2(consts.CANVAS_DIMS) / 2)
@@ -34,19 +134,20 @@ class Camera():
         return x * self.zoom
     
     def with_zindex(self, op: _SurfaceOp, zindex: int = 0):
-        layer = self._frame_blits.get(zindex, ([], []))
-        layer[0].append(op)
-        self._frame_blits[zindex] = layer
+        self.buffer.op(op, zindex)
 
     def with_zindex_provider[T](self, op: typing.Callable[[pygame.Surface, T], typing.Any], t: T, zindex: int = 0):
-        layer = self._frame_blits.get(zindex, ([], []))
-        layer[0].append(lambda s: op(s, t))
-        self._frame_blits[zindex] = layer
+        self.buffer.op(lambda s: op(s, t), zindex)
 
     def with_zindex_blit(self, params: _BlitParams, centered: bool = False, zindex: int = 0):
-        layer = self._frame_blits.get(zindex, ([], []))
-        layer[1].append((params[0], (pygame.Vector2(params[1]) - pygame.Vector2(params[0].size) / 2) if centered else params[1]))
-        self._frame_blits[zindex] = layer
+        self.buffer.blit(params[0], (pygame.Vector2(params[1]) - pygame.Vector2(params[0].size) / 2) if centered else params[1], zindex)
+
+    def draw_rect(self, color: pygame.typing.ColorLike, rect: pygame.Rect, width: int = 0, zindex: int = 0):
+        # rect is in screen space, use w2s_r for world rects
+        self.buffer.rect(color, rect, width, zindex)
+
+    def draw_text(self, font: text.PixelFont, string: str, scale: float, pos: pygame.Vector2, color: pygame.typing.ColorLike | None = None, centered: bool = False, zindex: int = 0):
+        self.buffer.text(font, string, scale, color, pos, centered, zindex)
 
     def vp(self, screencoord: bool = False) -> pygame.Rect:
         dims = pygame.Vector2(consts.CANVAS_DIMS) / self.zoom
@@ -78,14 +179,40 @@ class Camera():
         return AbsoluteCamera(self)
 
     def get_mouse_pos(self) -> pygame.Vector2:
+        if self.present_rect is not None and self.present_rect.w > 0 and self.present_rect.h > 0:
+            return ((pygame.Vector2(pygame.mouse.get_pos()) - pygame.Vector2(self.present_rect.topleft)).elementwise() / pygame.Vector2(self.present_rect.size)).elementwise() * pygame.Vector2(consts.CANVAS_DIMS)
         return (pygame.Vector2(pygame.mouse.get_pos()).elementwise() / pygame.Vector2(self.window.size)).elementwise() * pygame.Vector2(consts.CANVAS_DIMS)
 
+    def cull_vp(self) -> pygame.Rect:
+        cached = self._cull_vp
+        if cached is None or cached[0] != self.focus.x or cached[1] != self.focus.y or cached[2] != self.zoom:
+            cached = (self.focus.x, self.focus.y, self.zoom, self.vp().inflate(2, 2))
+            self._cull_vp = cached
+        return cached[3]
+
+    def is_visible(self, surface: pygame.Surface, pos: pygame.Vector2, centered: bool = True, scale: float = 1, rotation: float = 0.0) -> bool:
+        w = surface.get_width() * scale
+        h = surface.get_height() * scale
+        if rotation != 0.0:
+            rad = math.radians(rotation)
+            cos, sin = abs(math.cos(rad)), abs(math.sin(rad))
+            w, h = w * cos + h * sin, w * sin + h * cos
+
+        vp = self.cull_vp()
+        x = pos.x - w / 2 if centered else pos.x
+        y = pos.y - h / 2 if centered else pos.y
+        return x < vp.right and x + w > vp.left and y < vp.bottom and y + h > vp.top
+
     def blit(self, surface: pygame.Surface, pos: pygame.Vector2, centered: bool = True, scale: float = 1, rotation: float = 0.0, skip_cull: bool = False, zindex: int = 0):
 
+        # cull before paying for any transformation
+        if not skip_cull and not self.is_visible(surface, pos, centered, scale, rotation):
+            self.cull_stats.culled += 1
+            return
+        self.cull_stats.drawn += 1
+
         # resolve transformations
-        surface = pygame.transform.scale_by(surface, self.zoom * scale)
-        if rotation != 0.0:
-            surface = pygame.transform.rotate(surface, -rotation)
+        surface = self.transform_cache.get(surface, self.zoom * scale, rotation)
 
         # resolve position
         screen_pos = self.w2s(pos)
@@ -96,38 +223,35 @@ class Camera():
         self.with_zindex_blit((surface, screen_pos), zindex=zindex)
 
 
+    def blit_prescaled(self, surface: pygame.Surface, pos: pygame.Vector2, skip_cull: bool = False, zindex: int = 0):
+        # surface is already at screen scale for the current zoom, pos is its world-space topleft
+        if not skip_cull and not self.is_visible(surface, pos, False, 1 / self.zoom):
+            self.cull_stats.culled += 1
+            return
+        self.cull_stats.drawn += 1
+
+        self.with_zindex_blit((surface, self.w2s(pos)), zindex=zindex)
+
     def render(self, canvas: pygame.Surface):
-        canvas.fill(self.fill_col)
-        for zindex in sorted(self._frame_blits, key=lambda k: k):
-            layer = self._frame_blits[zindex]
-            canvas.blits(layer[1])
-            for op in layer[0]:
-                op(canvas)
+        with trace.span('Camera.render'):
+            self._render(canvas)
 
-        self._frame_blits = {}
+    def _render(self, canvas: pygame.Surface):
+        canvas.fill(self.fill_col)
+        self.buffer.render(canvas)
+        self.cull_stats.end_frame()
 
 class AbsoluteCamera(Camera):
     def __init__(self, camera: Camera) -> None:
-        super().__init__(camera.window)
+        super().__init__(camera.window, camera.transform_cache, camera.cull_stats, camera.buffer)
         self.parent = camera
+        self.present_rect = camera.present_rect
 
     def w2s(self, world: pygame.Vector2) -> pygame.Vector2:
         return world
+
+    def vp(self, screencoord: bool = False) -> pygame.Rect:
+        return pygame.Rect((0, 0), consts.CANVAS_DIMS)
     
     def scale_zoom(self, x: float) -> float:
         return x
-
-    def with_zindex(self, op: _SurfaceOp, zindex: int = 0):
-        layer = self.parent._frame_blits.get(zindex, ([], []))
-        layer[0].append(op)
-        self.parent._frame_blits[zindex] = layer
-
-    def with_zindex_provider[T](self, op: typing.Callable[[pygame.Surface, T], typing.Any], t: T, zindex: int = 0):
-        layer = self.parent._frame_blits.get(zindex, ([], []))
-        layer[0].append(lambda s: op(s, t))
-        self.parent._frame_blits[zindex] = layer
-
-    def with_zindex_blit(self, params: _BlitParams, centered: bool = False, zindex: int = 0):
-        layer = self.parent._frame_blits.get(zindex, ([], []))
-        layer[1].append((params[0], (pygame.Vector2(params[1]) - pygame.Vector2(params[0].size) / 2) if centered else params[1]))
-        self.parent._frame_blits[zindex] = layer
\ No newline at end of file
@@ -0,0 +1,88 @@
+import pygame
+import typing
+
+from src import consts
+from src.render import camera
+from src.render import text
+
+_UNSET: typing.Any = object()
+
+def opaque(color: pygame.typing.ColorLike) -> pygame.Color:
+    # hex ints are raw pixel values on SRCALPHA surfaces, which would make them fully transparent
+    if isinstance(color, int):
+        return pygame.Color((color >> 16) & 0xff, (color >> 8) & 0xff, color & 0xff)
+    return pygame.Color(color)
+
+class Widget():
+    renders_total: int = 0
+
+    def __init__(self, pos: pygame.Vector2, centered: bool = False, zindex: int = consts.HUD_LAYER) -> None:
+        self.pos = pos
+        self.centered = centered
+        self.zindex = zindex
+
+        self.key: typing.Any = _UNSET
+        self.surface: pygame.Surface | None = None
+        self.renders = 0
+
+    def set(self, key: typing.Any):
+        # only rebuild when what the widget would show actually changed
+        if key == self.key:
+            return
+
+        self.key = key
+        self.surface = self.build(key)
+        self.renders += 1
+        Widget.renders_total += 1
+
+    def build(self, key: typing.Any) -> pygame.Surface | None:
+        return None
+
+    def draw(self, cam: camera.Camera, offset: pygame.Vector2 | None = None):
+        if self.surface is None:
+            return
+        cam.with_zindex_blit((self.surface, self.pos + offset if offset is not None else self.pos), self.centered, self.zindex)
+
+class TextWidget(Widget):
+    def __init__(self, font: text.PixelFont, scale: float, pos: pygame.Vector2, color: pygame.typing.ColorLike | None = None, centered: bool = False, zindex: int = consts.HUD_LAYER) -> None:
+        super().__init__(pos, centered, zindex)
+        self.font = font
+        self.scale = scale
+        self.color = color
+
+    def build(self, key: str) -> pygame.Surface | None:
+        if not key:
+            return None
+        return self.font.render_adv(key, self.scale, self.color)
+
+class BarWidget(Widget):
+    # label on the left, then a framed bar, laid out relative to pos like the old immediate-mode bars
+    def __init__(self, label: str, color: pygame.typing.ColorLike, pos: pygame.Vector2, bar_offset: pygame.Vector2, width: int = 190, zindex: int = consts.HUD_LAYER) -> None:
+        super().__init__(pos, False, zindex)
+        self.label = text.glyphxel().render_adv(label, 2, 0x0)
+        self.color = color
+        self.bar_offset = bar_offset
+        self.width = width
+
+    def set_fill(self, fraction: float):
+        self.set(int(self.width * fraction))
+
+    def build(self, key: int) -> pygame.Surface:
+        x, y = int(self.bar_offset.x), int(self.bar_offset.y)
+        surface = pygame.Surface((x + self.width + 10, max(self.label.height, y + 20)), pygame.SRCALPHA)
+        surface.blit(self.label, (0, 0))
+        pygame.draw.rect(surface, opaque(0x000000), pygame.Rect(x, y, self.width + 10, 20))
+        pygame.draw.rect(surface, opaque(0xffffff), pygame.Rect(x + 5, y + 5, self.width, 10))
+        pygame.draw.rect(surface, opaque(self.color), pygame.Rect(x + 5, y + 5, key, 10))
+        return surface
+
+class Hud():
+    def __init__(self) -> None:
+        self.widgets: list[Widget] = []
+
+    def add[W: Widget](self, widget: W) -> W:
+        self.widgets.append(widget)
+        return widget
+
+    def renders(self) -> int:
+        return sum(widget.renders for widget in self.widgets)
@@ -1,8 +1,55 @@
 import pygame
 
+from src import consts
 from src.render import spritesheet
 from src.render import camera
 
+class BakedMap():
+    def __init__(self, data: MapRenderer.MapData, scale: float, chunk_tiles: int = consts.MAP_CHUNK_TILES) -> None:
+        self.data = data
+        self.scale = scale
+        self.chunk_tiles = chunk_tiles
+
+        self.zoom: float | None = None
+        self.chunks: list[tuple[pygame.Surface, pygame.Vector2]] = []
+
+    def invalidate(self, data: MapRenderer.MapData | None = None):
+        if data is not None:
+            self.data = data
+        self.zoom = None
+        self.chunks = []
+
+    def ensure(self, zoom: float):
+        if self.zoom == zoom:
+            return
+
+        size, tw, th, tiles = self.data
+        rows = (len(tiles) + size - 1) // size
+        self.chunks = []
+
+        for cy in range(0, rows, self.chunk_tiles):
+            for cx in range(0, size, self.chunk_tiles):
+                cw = min(self.chunk_tiles, size - cx)
+                ch = min(self.chunk_tiles, rows - cy)
+
+                chunk = pygame.Surface((cw * tw, ch * th), pygame.SRCALPHA)
+                empty = True
+                for y in range(ch):
+                    for x in range(cw):
+                        idx = (cy + y) * size + cx + x
+                        pair = tiles[idx] if idx < len(tiles) else None
+                        if pair is not None and pair[0] is not None:
+                            chunk.blit(pair[0], (x * tw, y * th))
+                            empty = False
+
+                if not empty:
+                    self.chunks.append((
+                        pygame.transform.scale_by(chunk, self.scale * zoom),
+                        pygame.Vector2(cx * tw, cy * th) * self.scale
+                    ))
+
+        self.zoom = zoom
+
 
 class MapRenderer():
     type MapData = tuple[
@@ -49,6 +96,12 @@ class MapRenderer():
 
         return rects
         
+    @staticmethod
+    def map_bounds(data: MapData, scale: float, pos: pygame.Vector2) -> pygame.Rect:
+        size, tw, th, tiles = data
+        rows = (len(tiles) + size - 1) // size
+        return pygame.Rect(pos, (size * tw * scale, rows * th * scale))
+
     @staticmethod
     def draw_map(cam: camera.Camera, pos: pygame.Vector2, data: MapData, scale: float, zindex: int = -5):
         size, tw, th, tiles = data
@@ -68,6 +121,16 @@ class MapRenderer():
                 pos.x = topleft.x
                 pos.y += th * scale
 
+    @staticmethod
+    def bake_map(data: MapData, scale: float, chunk_tiles: int = consts.MAP_CHUNK_TILES) -> BakedMap:
+        return BakedMap(data, scale, chunk_tiles)
+
+    @staticmethod
+    def draw_baked(cam: camera.Camera, pos: pygame.Vector2, baked: BakedMap, zindex: int = -5):
+        baked.ensure(cam.zoom)
+        for surface, offset in baked.chunks:
+            cam.blit_prescaled(surface, pos + offset, zindex=zindex)
+
     @staticmethod
     def get_tile_center(tile_x: float, tile_y: float, cam: camera.Camera, pos: pygame.Vector2, data: MapData, scale: float) -> pygame.Vector2:
         size, tw, th, tiles = data
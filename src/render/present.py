@@ -0,0 +1,72 @@
+import pygame
+
+from src import consts
+
+class Presenter():
+    MODE_NEAREST: str = 'nearest'
+    MODE_INTEGER: str = 'integer'
+    MODE_SMOOTH: str = 'smooth'
+
+    MODES: list[str] = [MODE_NEAREST, MODE_INTEGER, MODE_SMOOTH]
+
+    def __init__(self, mode: str = consts.PRESENT_MODE) -> None:
+        if mode not in Presenter.MODES:
+            raise ValueError(f"mode must be one of {Presenter.MODES}, {mode} is not")
+        self.mode = mode
+
+        self.reallocations = 0
+
+        self._layout_key: tuple[int, int, int, int, str] | None = None
+        self._target: pygame.Surface | None = None
+        self._dest: pygame.Surface | None = None
+        self._dest_rect = pygame.Rect(0, 0, 0, 0)
+
+    def dest_rect(self) -> pygame.Rect:
+        return self._dest_rect
+
+    def set_mode(self, mode: str):
+        if mode not in Presenter.MODES:
+            raise ValueError(f"mode must be one of {Presenter.MODES}, {mode} is not")
+        self.mode = mode
+
+    def cycle_mode(self):
+        self.set_mode(Presenter.MODES[(Presenter.MODES.index(self.mode) + 1) % len(Presenter.MODES)])
+
+    def present(self, canvas: pygame.Surface, target: pygame.Surface):
+        key = (*canvas.size, *target.size, self.mode)
+        if key != self._layout_key or target is not self._target:
+            self._layout(canvas, target)
+            self._layout_key = key
+
+        dest = self._dest
+        if dest is None:
+            return
+
+        if dest.size == canvas.size:
+            target.blit(canvas, self._dest_rect)
+        elif self.mode == Presenter.MODE_SMOOTH:
+            pygame.transform.smoothscale(canvas, dest.size, dest)
+        else:
+            pygame.transform.scale(canvas, dest.size, dest)
+
+    def _layout(self, canvas: pygame.Surface, target: pygame.Surface):
+        cw, ch = canvas.size
+        tw, th = target.size
+
+        if self.mode == Presenter.MODE_INTEGER and tw >= cw and th >= ch:
+            factor = min(tw // cw, th // ch)
+            w, h = cw * factor, ch * factor
+        elif self.mode == Presenter.MODE_INTEGER:
+            # window is smaller than the canvas, fall back to the largest aspect-correct fit
+            factor = min(tw / cw, th / ch)
+            w, h = max(1, int(cw * factor)), max(1, int(ch * factor))
+        else:
+            w, h = tw, th
+
+        self._dest_rect = pygame.Rect((tw - w) // 2, (th - h) // 2, w, h)
+
+        # the letterbox bars are never drawn over, so they only need clearing when the layout changes
+        target.fill(0x0)
+        self._target = target
+        self._dest = target.subsurface(self._dest_rect) if w > 0 and h > 0 else None
+        self.reallocations += 1
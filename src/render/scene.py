@@ -1,20 +1,42 @@
 from __future__ import annotations
+from src import assets
+from src import event
+from src import trace
 from src.render import camera
 
 
 class SceneManager():
     def __init__(self, camera: camera.Camera, default: type[Scene], ctx: tuple) -> None:
+        self.scope = assets.AssetRegistry.open_scope()
+        assets.AssetRegistry.enter_scope(self.scope)
+        event.SCHEDULER.owner = self.scope
         self.current = default(camera, ctx)
 
 
     def draw_current(self, camera: camera.Camera):
-        self.current.draw(camera)
+        with trace.span('SceneManager.draw_current'):
+            self.current.draw(camera)
 
     def update_current(self, dt: float, camera: camera.Camera):
-        self.current.update(dt, camera)
+        with trace.span('SceneManager.update_current'):
+            self.current.update(dt, camera)
 
     def change(self, camera: camera.Camera, scene: type[Scene], ctx: tuple):
+        with trace.span('SceneManager.change', {'scene': scene.__name__}):
+            self._change(camera, scene, ctx)
+
+    def _change(self, camera: camera.Camera, scene: type[Scene], ctx: tuple):
+        # textures shared with the outgoing scene are acquired before it lets go of them, so they are never reloaded
+        previous_scope = self.scope
+        self.scope = assets.AssetRegistry.open_scope()
+        assets.AssetRegistry.enter_scope(self.scope)
+
+        # timers scheduled by the outgoing scene die with it
+        event.SCHEDULER.cancel_owner(previous_scope)
+        event.SCHEDULER.owner = self.scope
+
         self.current = scene(camera, ctx)
+        assets.AssetRegistry.release_scope(previous_scope)
 
 
 class Scene():
@@ -25,4 +47,10 @@ class Scene():
         pass
 
     def update(self, dt: float, camera: camera.Camera):
-        pass
\ No newline at end of file
+        pass
+
+    def entity_counts(self) -> dict[str, int]:
+        return {}
+
+    def entity_count(self) -> int:
+        return sum(self.entity_counts().values())
\ No newline at end of file
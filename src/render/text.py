@@ -1,13 +1,22 @@
 from __future__ import annotations
 import pygame
+import collections
 
 from src import util
+from src import consts
+from src import assets
 from src.render import spritesheet
 
 class PixelFont():
     GLYPHXEL: PixelFont | None = None
     SF_SANS: PixelFont | None = None
 
+    RENDER_CACHE: collections.OrderedDict[tuple, pygame.Surface] = collections.OrderedDict()
+    RENDER_CACHE_SIZE: int = consts.TEXT_CACHE_ENTRIES
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_evictions: int = 0
+
     def __init__(self, 
                  name: str, 
                  spritesheet: spritesheet.Spritesheet, 
@@ -26,6 +35,12 @@ class PixelFont():
         self.rows = rows
         self.cols = columns 
 
+        # codepoint -> (cell x, cell y, advance), first occurrence wins like codepoints.index did
+        self.glyphs: dict[str, tuple[int, int, int]] = {}
+        for idx, char in enumerate(codepoints):
+            if char not in self.glyphs:
+                self.glyphs[char] = (idx % self.cols, idx // self.cols, self.get_character_width(char))
+
     
     def get_character_width(self, char: str) -> int:
         if char in self.specific_character_widths:
@@ -40,19 +55,11 @@ class PixelFont():
         if len(char) != 1:
             raise ValueError("char must be a single character")
         
-        if not char in self.codepoints:
+        glyph = self.glyphs.get(char)
+        if glyph is None:
             raise ValueError(f"char must be in the list of codepoints, {char} is not")
-        
-        idx = self.codepoints.index(char)
-        x = 0
-        y = 0
 
-        while idx >= self.cols:
-            y += 1
-            idx -= self.cols
-        x = idx
-
-        return (x, y)
+        return (glyph[0], glyph[1])
 
 
     def verify_all_codepoints(self, text: str) -> bool:
@@ -74,7 +81,8 @@ class PixelFont():
                     longest_line_width = line_width
                 line_width = 0
             else:
-                line_width += self.get_character_width(char)
+                glyph = self.glyphs.get(char)
+                line_width += glyph[2] if glyph is not None else self.get_character_width(char)
 
         if line_width > longest_line_width:
             longest_line_width = line_width
@@ -96,22 +104,54 @@ class PixelFont():
                 line += 1
                 width_pos = 0
             else:
-                pos = self.get_codepoint_pos(char)
-                width = self.get_character_width(char)
-                self.spritesheet.fast_cell_blit_to_surface(pos[0], pos[1], surface, (width_pos, line * self.spritesheet.cell_h))
-                width_pos += width
+                glyph = self.glyphs.get(char)
+                if glyph is None:
+                    raise ValueError(f"char must be in the list of codepoints, {char} is not")
+                self.spritesheet.fast_cell_blit_to_surface(glyph[0], glyph[1], surface, (width_pos, line * self.spritesheet.cell_h))
+                width_pos += glyph[2]
 
         return surface
     
     def render_adv(self, text: str, scale: float, color: pygame.typing.ColorLike | None = None) -> pygame.Surface:
+        # the returned surface is shared through the cache, callers must not draw onto it
+        key = (self.name, text, scale, PixelFont.color_key(color))
+        cached = PixelFont.RENDER_CACHE.get(key)
+        if cached is not None:
+            PixelFont.RENDER_CACHE.move_to_end(key)
+            PixelFont.cache_hits += 1
+            return cached
+
+        PixelFont.cache_misses += 1
         s = pygame.transform.scale_by(self.render(text), scale)
         if color is not None:
             s.fill(color, special_flags=pygame.BLEND_MULT)
+
+        PixelFont.RENDER_CACHE[key] = s
+        while len(PixelFont.RENDER_CACHE) > PixelFont.RENDER_CACHE_SIZE:
+            PixelFont.RENDER_CACHE.popitem(last=False)
+            PixelFont.cache_evictions += 1
         return s
 
+    @staticmethod
+    def color_key(color: pygame.typing.ColorLike | None) -> int | str | tuple | None:
+        if color is None or isinstance(color, (int, str)):
+            return color
+        return tuple(color)
+
+    @staticmethod
+    def cache_stats() -> dict[str, float]:
+        lookups = PixelFont.cache_hits + PixelFont.cache_misses
+        return {
+            'entries': len(PixelFont.RENDER_CACHE),
+            'hits': PixelFont.cache_hits,
+            'misses': PixelFont.cache_misses,
+            'evictions': PixelFont.cache_evictions,
+            'hit_rate': PixelFont.cache_hits / lookups if lookups > 0 else 0.0,
+        }
+
     @staticmethod
     def init_pixelfonts():
-        PixelFont.GLYPHXEL = PixelFont("Glyphxel", spritesheet.Spritesheet(util.load_texture("res/glyphxel.png"), 0, 0, 16, 16), 16, 16,
+        PixelFont.GLYPHXEL = PixelFont("Glyphxel", spritesheet.Spritesheet(util.load_texture("res/glyphxel.png", assets.GLOBAL_SCOPE), 0, 0, 16, 16), 16, 16,
                                     "ABCDEFGHIJKLMNOP" +
                                     "QRSTUVWXYZ ,.!?|" +
                                     "abcdefghijklmnop" +
@@ -130,7 +170,7 @@ class PixelFont():
                                         "'": 4,
                                     })
         
-        PixelFont.SF_SANS = PixelFont("SF Sans", spritesheet.Spritesheet(util.load_texture("res/sf-sans.png"), 0, 0, 16, 16), 16, 16, 
+        PixelFont.SF_SANS = PixelFont("SF Sans", spritesheet.Spritesheet(util.load_texture("res/sf-sans.png", assets.GLOBAL_SCOPE), 0, 0, 16, 16), 16, 16, 
                 "ABCDEFGHIJKLMNOP" +
                 "QRSTUVWXYZ ,.!?|" +
                 "abcdefghijklmnop" +
@@ -0,0 +1,99 @@
+import pygame
+import collections
+import weakref
+
+from src import consts
+
+type _TransformKey = tuple[int, float, float]
+
+class TransformCache():
+    def __init__(self, max_bytes: int = consts.TRANSFORM_CACHE_BYTES, rotation_step: float = consts.TRANSFORM_ROTATION_STEP) -> None:
+        self.max_bytes = max_bytes
+        self.rotation_step = rotation_step
+
+        self.entries: collections.OrderedDict[_TransformKey, pygame.Surface] = collections.OrderedDict()
+        self.bytes = 0
+
+        # entries are keyed by source identity, so they are dropped as soon as the source surface dies
+        self._sources: dict[int, weakref.ref[pygame.Surface]] = {}
+        self._keys_by_source: dict[int, list[_TransformKey]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def quantize_rotation(self, rotation: float) -> float:
+        if self.rotation_step <= 0:
+            return rotation % 360
+        return (round(rotation / self.rotation_step) * self.rotation_step) % 360
+
+    def get(self, surface: pygame.Surface, scale: float, rotation: float = 0.0) -> pygame.Surface:
+        rotation = self.quantize_rotation(rotation) if rotation != 0.0 else 0.0
+        if scale == 1 and rotation == 0.0:
+            return surface
+
+        key = (id(surface), scale, rotation)
+        cached = self.entries.get(key)
+        if cached is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        transformed = pygame.transform.scale_by(surface, scale)
+        if rotation != 0.0:
+            transformed = pygame.transform.rotate(transformed, -rotation)
+
+        self._insert(key, surface, transformed)
+        return transformed
+
+    def clear(self):
+        self.entries.clear()
+        self._sources.clear()
+        self._keys_by_source.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def _insert(self, key: _TransformKey, source: pygame.Surface, transformed: pygame.Surface):
+        size = TransformCache.surface_bytes(transformed)
+        if size > self.max_bytes:
+            return
+
+        sid = key[0]
+        if sid not in self._sources:
+            self._sources[sid] = weakref.ref(source, lambda _, sid=sid: self._drop_source(sid))
+        self._keys_by_source.setdefault(sid, []).append(key)
+
+        self.entries[key] = transformed
+        self.bytes += size
+
+        while self.bytes > self.max_bytes and self.entries:
+            old_key, old = self.entries.popitem(last=False)
+            self.bytes -= TransformCache.surface_bytes(old)
+            self.evictions += 1
+
+            keys = self._keys_by_source.get(old_key[0])
+            if keys is not None:
+                keys.remove(old_key)
+                if not keys:
+                    del self._keys_by_source[old_key[0]]
+                    self._sources.pop(old_key[0], None)
+
+    def _drop_source(self, sid: int):
+        self._sources.pop(sid, None)
+        for key in self._keys_by_source.pop(sid, []):
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.bytes -= TransformCache.surface_bytes(old)
+
+    @staticmethod
+    def surface_bytes(surface: pygame.Surface) -> int:
+        return surface.get_pitch() * surface.get_height()
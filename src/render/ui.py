@@ -19,7 +19,7 @@ class UiContainer():
                 element.draw(cam)
 
                 if consts.DRAW_COLLISION_BOXES:
-                    cam.with_zindex_provider(lambda s, r: pygame.draw.rect(s, 'green', r, 8), element.rect())
+                    cam.draw_rect('green', element.rect(), 8)
 
         if consts.DRAW_COLLISION_BOXES:
             cam.with_zindex_provider(lambda s, p: pygame.draw.circle(s, 'red', p, 8), cam.get_mouse_pos())
@@ -0,0 +1,85 @@
+import pygame
+import typing
+
+from src import consts
+from src import trace
+
+class SoundHandle():
+    def __init__(self, path: str, sound: pygame.mixer.Sound) -> None:
+        self.path = path
+        self.sound = sound
+        self.max_voices = SoundBank.VOICE_LIMITS.get(path, consts.SOUND_MAX_VOICES)
+        self.voices: list[pygame.mixer.Channel] = []
+
+    def play(self) -> pygame.mixer.Channel | None:
+        self.voices = [ch for ch in self.voices if ch.get_busy() and ch.get_sound() is self.sound]
+
+        if len(self.voices) >= self.max_voices:
+            SoundBank.dropped += 1
+            return None
+
+        channel = self.sound.play()
+        if channel is not None:
+            self.voices.append(channel)
+            SoundBank.played += 1
+        return channel
+
+    def stop(self):
+        self.sound.stop()
+        self.voices.clear()
+
+class SoundBank():
+    SOUNDS: dict[str, SoundHandle] = {}
+    VOICE_LIMITS: dict[str, int] = {
+        'res/sound/cannon.ogg': 3,
+        'res/sound/damage.ogg': 3,
+        'res/sound/footstep.ogg': 2,
+    }
+    PRELOAD: list[str] = [
+        'res/sound/barrel.ogg',
+        'res/sound/cannon.ogg',
+        'res/sound/damage.ogg',
+        'res/sound/drink.ogg',
+        'res/sound/eat.ogg',
+        'res/sound/footstep.ogg',
+        'res/sound/lose.ogg',
+        'res/sound/pickup.ogg',
+        'res/sound/repair.ogg',
+        'res/sound/scurvy.ogg',
+        'res/sound/win.ogg',
+    ]
+
+    loads: int = 0
+    played: int = 0
+    dropped: int = 0
+
+    @staticmethod
+    def init_channels():
+        pygame.mixer.set_num_channels(consts.SOUND_CHANNELS)
+
+    @staticmethod
+    def preload(paths: typing.Iterable[str]):
+        for path in paths:
+            SoundBank.get(path)
+
+    @staticmethod
+    def get(path: str) -> SoundHandle:
+        handle = SoundBank.SOUNDS.get(path)
+        if handle is None:
+            with trace.span('SoundBank.load', {'path': path}):
+                handle = SoundHandle(path, pygame.mixer.Sound(path))
+            SoundBank.SOUNDS[path] = handle
+            SoundBank.loads += 1
+        return handle
+
+    @staticmethod
+    def stats() -> dict[str, typing.Any]:
+        return {
+            'sounds': len(SoundBank.SOUNDS),
+            'loads': SoundBank.loads,
+            'played': SoundBank.played,
+            'dropped': SoundBank.dropped,
+        }
+
+def get(path: str) -> SoundHandle:
+    return SoundBank.get(path)
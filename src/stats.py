@@ -0,0 +1,98 @@
+import pygame
+import collections
+import time
+
+from src import consts
+from src.render import camera
+from src.render import text
+
+class FrameStats():
+    PHASES: list[str] = ['event', 'update', 'draw', 'render', 'present', 'flip', 'wait']
+
+    def __init__(self, window: int = consts.STATS_WINDOW) -> None:
+        self.window = window
+
+        self.frame_times: collections.deque[float] = collections.deque(maxlen=window)
+        self.phase_times: dict[str, collections.deque[float]] = {phase: collections.deque(maxlen=window) for phase in FrameStats.PHASES}
+
+        # counters hold the last finished frame, totals the running values they are derived from
+        self.counters: dict[str, int] = {}
+        self._totals: dict[str, int] = {}
+
+        self._frame_start = 0.0
+        self._lap_start = 0.0
+
+    def begin_frame(self):
+        self._frame_start = self._lap_start = time.perf_counter()
+
+    def lap(self, phase: str):
+        now = time.perf_counter()
+        self.phase_times[phase].append(now - self._lap_start)
+        self._lap_start = now
+
+    def end_frame(self):
+        self.frame_times.append(time.perf_counter() - self._frame_start)
+
+    def count(self, name: str, value: int):
+        self.counters[name] = value
+
+    def count_total(self, name: str, total: int):
+        # turns an ever-increasing counter into a per-frame delta
+        self.counters[name] = total - self._totals.get(name, total)
+        self._totals[name] = total
+
+    @staticmethod
+    def percentile(samples: list[float], p: float) -> float:
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(round(p / 100 * (len(samples) - 1))))]
+
+    def frame_percentiles(self) -> tuple[float, float, float]:
+        ordered = sorted(self.frame_times)
+        return (
+            FrameStats.percentile(ordered, 50),
+            FrameStats.percentile(ordered, 95),
+            FrameStats.percentile(ordered, 99),
+        )
+
+    def phase_mean(self, phase: str) -> float:
+        samples = self.phase_times[phase]
+        return sum(samples) / len(samples) if samples else 0.0
+
+class StatsOverlay():
+    def __init__(self, stats: FrameStats) -> None:
+        self.stats = stats
+        self.visible = consts.STATS_OVERLAY_VISIBLE
+
+        self.lines: list[str] = []
+        self._refresh_timer = 0.0
+
+    def toggle(self):
+        self.visible = not self.visible
+        self._refresh_timer = 0.0
+
+    def update(self, dt: float):
+        if not self.visible:
+            return
+
+        # refreshing a few times a second keeps the text readable and the font cache warm
+        self._refresh_timer -= dt
+        if self._refresh_timer > 0:
+            return
+        self._refresh_timer = consts.STATS_OVERLAY_REFRESH
+
+        p50, p95, p99 = self.stats.frame_percentiles()
+        fps = 1 / p50 if p50 > 0 else 0.0
+        self.lines = [
+            f"frame {p50 * 1000:.2f} / {p95 * 1000:.2f} / {p99 * 1000:.2f} ms (p50/p95/p99)  {fps:.0f} fps",
+            "  ".join(f"{phase} {self.stats.phase_mean(phase) * 1000:.2f}" for phase in FrameStats.PHASES),
+            "  ".join(f"{name} {value}" for name, value in self.stats.counters.items()),
+        ]
+
+    def draw(self, cam: camera.Camera):
+        if not self.visible:
+            return
+
+        absolute = cam.absolute()
+        for i, line in enumerate(self.lines):
+            absolute.draw_text(text.glyphxel(), line, 1.5, pygame.Vector2(10, consts.CANVAS_DIMS[1] - 30 * (len(self.lines) - i)), 0xffff00, zindex=consts.STATS_LAYER)
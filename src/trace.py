@@ -0,0 +1,70 @@
+import collections
+import contextlib
+import json
+import os
+import threading
+import time
+import typing
+
+from src import consts
+
+type _TraceEvent = tuple[str, str, int, int, int, dict[str, typing.Any] | None]
+
+class Span():
+    def __init__(self, name: str, args: dict[str, typing.Any] | None) -> None:
+        self.name = name
+        self.args = args
+        self.start = 0
+
+    def __enter__(self) -> Span:
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        Tracer.EVENTS.append(('X', self.name, self.start // 1000, (end - self.start) // 1000, threading.get_ident(), self.args))
+
+class Tracer():
+    EVENTS: collections.deque[_TraceEvent] = collections.deque(maxlen=consts.TRACE_BUFFER_EVENTS)
+    enabled: bool = False
+
+    _NULL_SPAN: contextlib.nullcontext = contextlib.nullcontext()
+
+    @staticmethod
+    def enable(enabled: bool = True):
+        Tracer.enabled = enabled
+
+    @staticmethod
+    def clear():
+        Tracer.EVENTS.clear()
+
+    @staticmethod
+    def dump(path: str | None = None) -> str:
+        if path is None:
+            os.makedirs(consts.TRACE_DIR, exist_ok=True)
+            path = os.path.join(consts.TRACE_DIR, f"trace-{time.strftime('%Y%m%d-%H%M%S')}.json")
+
+        pid = os.getpid()
+        events = []
+        for ph, name, ts, dur, tid, args in list(Tracer.EVENTS):
+            e: dict[str, typing.Any] = {'name': name, 'ph': ph, 'ts': ts, 'pid': pid, 'tid': tid}
+            if ph == 'X':
+                e['dur'] = dur
+            else:
+                e['s'] = 't'
+            if args:
+                e['args'] = args
+            events.append(e)
+
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return path
+
+def span(name: str, args: dict[str, typing.Any] | None = None) -> typing.ContextManager:
+    if not Tracer.enabled:
+        return Tracer._NULL_SPAN
+    return Span(name, args)
+
+def instant(name: str, args: dict[str, typing.Any] | None = None):
+    if Tracer.enabled:
+        Tracer.EVENTS.append(('i', name, time.perf_counter_ns() // 1000, 0, threading.get_ident(), args))
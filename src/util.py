@@ -1,8 +1,10 @@
 import pygame
 
+from src import assets
 
-def load_texture(path: str) -> pygame.Surface:
-    return pygame.image.load(path).convert_alpha()
+
+def load_texture(path: str, scope: int | None = None) -> pygame.Surface:
+    return assets.AssetRegistry.acquire_texture(path, scope)
 
 
 def resolve_collision(static: pygame.Rect, dynamic: pygame.Rect) -> pygame.Vector2:
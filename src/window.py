@@ -1,15 +1,30 @@
 import pygame
 
 from src import util
+from src import assets
 from src import event
+from src import sound
 from src import consts
+from src import stats
+from src import trace
+from src import profiler
 from src.render import scene
 from src.render import camera
+from src.render import present
 from src.render import spritesheet
 from src.render import text
+from src.render import hud
+from src.game import brain
+from src.game import navigation
 
 class Window():
-    def __init__(self, default_scene: type[scene.Scene]) -> None:
+    KEY_STATS_OVERLAY: int = pygame.K_F3
+    KEY_DUMP_TRACE: int = pygame.K_F9
+    KEY_PROFILE: int = pygame.K_F10
+
+    def __init__(self, default_scene: type[scene.Scene], headless: bool = False) -> None:
+        self.headless = headless
+
         self.window = pygame.window.Window(
             title=consts.TITLE,
             size=consts.WINDOW_DIMS,
@@ -18,6 +33,11 @@ class Window():
 
         self.window_surface = self.window.get_surface()
         self.canvas = pygame.Surface(consts.CANVAS_DIMS)
+        self.presenter = present.Presenter()
+
+        self.stats = stats.FrameStats()
+        self.stats_overlay = stats.StatsOverlay(self.stats)
+        self.profiler = profiler.FrameProfiler()
 
         self.clock = pygame.Clock()
         self.keep_open = False
@@ -25,13 +45,14 @@ class Window():
         self.camera = camera.Camera(self.window)
         self.scene_manager = scene.SceneManager(self.camera, default_scene, ())
 
-        pygame.mixer.music.load('res/sound/pirate-plunder.ogg')
-        pygame.mixer.music.set_volume(0.25)
-        pygame.mixer.music.play(-1)
+        if not headless:
+            pygame.mixer.music.load('res/sound/pirate-plunder.ogg')
+            pygame.mixer.music.set_volume(0.25)
+            pygame.mixer.music.play(-1)
 
         event.CallbackManager.register(event.CHANGE_SCENE, lambda d: self.scene_manager.change(self.camera, d['scene'], d['ctx']))
 
-        player_spr = spritesheet.Spritesheet(util.load_texture('res/pirate.png'))
+        player_spr = spritesheet.Spritesheet(util.load_texture('res/pirate.png', assets.GLOBAL_SCOPE))
         c = player_spr.get_cell(1, 1)
         self.window.set_icon(c)
 
@@ -75,37 +96,91 @@ class Window():
 
     def init_resources(self):
         text.PixelFont.init_pixelfonts()
+        sound.SoundBank.init_channels()
+        sound.SoundBank.preload(sound.SoundBank.PRELOAD)
 
     def start(self):
         self.keep_open = True
         dt = 0.0
 
         while self.keep_open:
-            self.event(dt)
-            self.update(dt)
-            self.draw(self.canvas)
-            
-            self.window_surface.blit(pygame.transform.scale(self.canvas, self.window_surface.size))
-
-            self.window.flip()
-            dt = self.clock.tick(consts.TARGET_FRAMERATE) / 1000
-
-            self.window.title = f"{consts.TITLE} | FPS: {self.clock.get_fps():.0f}"
+            with trace.span('frame'):
+                self.profiler.begin_frame()
+                self.stats.begin_frame()
+
+                with trace.span('Window.event'):
+                    self.event(dt)
+                with trace.span('Window.update'):
+                    self.update(dt)
+                with trace.span('Window.draw'):
+                    self.draw(self.canvas)
+                
+                with trace.span('Window.present'):
+                    # the window surface is re-fetched so a resize hands the presenter the new one
+                    self.window_surface = self.window.get_surface()
+                    self.presenter.present(self.canvas, self.window_surface)
+                    self.camera.present_rect = self.presenter.dest_rect()
+                    self.stats.lap('present')
+
+                    self.window.flip()
+                    self.stats.lap('flip')
+
+                with trace.span('Window.wait'):
+                    dt = self.clock.tick(consts.TARGET_FRAMERATE) / 1000
+                self.stats.lap('wait')
+                self.stats.end_frame()
+
+                path = self.profiler.end_frame(self.scene_manager.current)
+                if path is not None:
+                    print(f"profile written to {path}")
+
+        if trace.Tracer.enabled:
+            print(f"trace written to {trace.Tracer.dump()}")
 
 
     def draw(self, cvs: pygame.Surface):
-        cvs.fill(0x0)
         self.scene_manager.draw_current(self.camera)
-        self.camera.render(self.canvas)
+        self.stats_overlay.draw(self.camera)
+        self.stats.lap('draw')
+
+        self.camera.render(cvs)
+        self.stats.lap('render')
+
+        self.count_stats()
 
     def update(self, dt: float):
+        event.SCHEDULER.tick(dt)
         self.scene_manager.update_current(dt, self.camera)
+        self.stats_overlay.update(dt)
+        self.stats.lap('update')
+
+    def count_stats(self):
+        self.stats.count('blits', self.camera.cull_stats.last_drawn)
+        self.stats.count('culled', self.camera.cull_stats.last_culled)
+        self.stats.count('commands', self.camera.buffer.last_submitted)
+        self.stats.count_total('surfaces', self.camera.transform_cache.misses + text.PixelFont.cache_misses)
+        self.stats.count_total('text', text.PixelFont.cache_misses)
+        self.stats.count_total('hud', hud.Widget.renders_total)
+        self.stats.count_total('decisions', brain.Brain.decisions)
+        self.stats.count_total('flowfields', navigation.NavGrid.builds_total)
+        self.stats.count('entities', self.scene_manager.current.entity_count())
 
     def event(self, dt: float):
         for e in pygame.event.get():
             if e.type == pygame.QUIT:
                 self.keep_open = False
 
+            if e.type == pygame.KEYDOWN and e.key == Window.KEY_STATS_OVERLAY:
+                self.stats_overlay.toggle()
+
+            if e.type == pygame.KEYDOWN and e.key == Window.KEY_PROFILE:
+                self.profiler.request()
+
+            if e.type == pygame.KEYDOWN and e.key == Window.KEY_DUMP_TRACE and trace.Tracer.enabled:
+                print(f"trace written to {trace.Tracer.dump()}")
+
             if e.type in event.CallbackManager.CALLBACKS:
                 for o in event.CallbackManager.CALLBACKS[e.type]:
-                    o(e.dict)
\ No newline at end of file
+                    o(e.dict)
+
+        self.stats.lap('event')
\ No newline at end of file